@@ -0,0 +1,80 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare a torch.compile'd model with and without shapeguard checks.
+
+Usage: python benchmarks/torch_compile.py
+"""
+
+import timeit
+
+# load the torch compiler stack before TensorFlow (imported by shapeguard),
+# since the other order can crash on import in some environments
+import torch
+import torch._dynamo
+
+from shapeguard import ShapeGuard
+
+
+class Model(torch.nn.Module):
+    def __init__(self, d: int, k: int, checked: bool):
+        super().__init__()
+        self.inp = torch.nn.Linear(d, 4 * d)
+        self.out = torch.nn.Linear(4 * d, k)
+        self.sg = ShapeGuard(dims={"D": d, "K": k}) if checked else None
+
+    def forward(self, x):
+        # batch size and sequence length vary, so they are private dims
+        if self.sg is not None:
+            self.sg.guard(x, "_B, _T, D")
+        h = torch.relu(self.inp(x))
+        y = self.out(h)
+        if self.sg is not None:
+            self.sg.guard(h, "_B, _T, 4*D")
+            y = self.sg.reshape(self.sg.guard(y, "_B, _T, K"), "*, K")
+        else:
+            y = y.reshape(-1, y.shape[-1])
+        return y.softmax(-1)
+
+
+def main(d=64, k=32, iterations=200):
+    torch.manual_seed(0)
+    inputs = [torch.randn(b, t, d) for b, t in [(8, 16), (4, 50), (16, 7)]]
+    results = {}
+    for checked in [False, True]:
+        model = Model(d, k, checked)
+        model(inputs[0])  # eager warm-up also caches the parsed templates
+        explanation = torch._dynamo.explain(model)(inputs[0])
+        compiled = torch.compile(model, dynamic=True)
+        for x in inputs:
+            compiled(x)  # compile (once, shapes are symbolic)
+        seconds = min(
+            timeit.repeat(
+                lambda: [compiled(x) for x in inputs], number=iterations, repeat=3
+            )
+        )
+        results[checked] = seconds
+        print(
+            "{:<16} graphs: {}  graph breaks: {}  {:.1f} us/call".format(
+                "with checks" if checked else "without checks",
+                explanation.graph_count,
+                explanation.graph_break_count,
+                1e6 * seconds / iterations / len(inputs),
+            )
+        )
+    print("relative time with checks: {:.3f}".format(results[True] / results[False]))
+
+
+if __name__ == "__main__":
+    main()
@@ -17,9 +17,18 @@
 from shapeguard.exception import ShapeError
 from shapeguard.guard import ShapeGuard
 from shapeguard.tools import matches
+from shapeguard.tools import check
 from shapeguard.tools import evaluate
 from shapeguard.tools import reshape
+from shapeguard.tools import rearrange
+from shapeguard.tools import einsum
+from shapeguard.tools import expand
+from shapeguard.tools import broadcast
+from shapeguard.tools import tensor_spec
+from shapeguard.tools import shape_dtype_struct
 from shapeguard.tools import get_shape
+from shapeguard.dispatcher import dispatch
+from shapeguard.padding import pad_to_bucket
 
 
 __version__ = "0.1.0"
@@ -36,9 +45,18 @@ __all__ = (
     "__author__",
     "__author_email__",
     "matches",
+    "check",
     "evaluate",
     "guard",
     "reshape",
+    "rearrange",
+    "einsum",
+    "expand",
+    "broadcast",
+    "tensor_spec",
+    "shape_dtype_struct",
     "get_shape",
+    "dispatch",
+    "pad_to_bucket",
     "ShapeError",
 )
@@ -0,0 +1,43 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Command line entry point: python -m shapeguard {audit,trace} ..."""
+
+import sys
+from typing import List, Optional
+
+COMMANDS = ("audit", "trace")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print(
+            "usage: python -m shapeguard {{{}}} ...".format(",".join(COMMANDS)),
+            file=sys.stderr,
+        )
+        return 2
+    command, args = argv[0], argv[1:]
+    if command == "audit":
+        from shapeguard import audit
+
+        return audit.main(args)
+    else:
+        from shapeguard import trace
+
+        return trace.main(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
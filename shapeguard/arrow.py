@@ -0,0 +1,80 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Reads tensor shapes of pyarrow arrays and Parquet files from metadata.
+
+Shapes come from the types (FixedSizeList, FixedShapeTensor) and, for
+variable-size lists, from the offsets buffers. Values are never converted.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+Shape = List[Optional[int]]
+
+
+def arrow_shape(array) -> Shape:
+    """Return the shape of a pyarrow Array or ChunkedArray.
+
+    The first entry is the length. Variable-size lists contribute their
+    size if all lists have the same size and None (a ragged dim) otherwise.
+    """
+    import pyarrow as pa
+
+    chunks = array.chunks if isinstance(array, pa.ChunkedArray) else [array]
+    return [len(array)] + value_shape(array.type, chunks)
+
+
+def value_shape(arrow_type, chunks: Optional[Sequence] = None) -> Shape:
+    """Return the shape of a single value of arrow_type.
+
+    Args:
+      arrow_type: pyarrow.DataType.
+      chunks: arrays of that type, used to find the sizes of variable-size
+        lists. Without them such lists are always None.
+    """
+    import pyarrow as pa
+
+    if isinstance(arrow_type, pa.FixedShapeTensorType):
+        return list(arrow_type.shape)
+    if pa.types.is_fixed_size_list(arrow_type):
+        values = None if chunks is None else [c.flatten() for c in chunks]
+        return [arrow_type.list_size] + value_shape(arrow_type.value_type, values)
+    if pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type):
+        if chunks is None:
+            return [None] + value_shape(arrow_type.value_type)
+        sizes = set()
+        for c in chunks:
+            sizes.update(np.unique(np.diff(c.offsets.to_numpy())).tolist())
+        size = sizes.pop() if len(sizes) == 1 else None
+        values = [c.flatten() for c in chunks]
+        return [size] + value_shape(arrow_type.value_type, values)
+    return []
+
+
+def parquet_shapes(path) -> Dict[str, Shape]:
+    """Return the shape of each column of a Parquet file.
+
+    Only the footer metadata is read (memory mapped), so variable-size lists
+    are None.
+    """
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    num_rows = parquet_file.metadata.num_rows
+    return {
+        field.name: [num_rows] + value_shape(field.type)
+        for field in parquet_file.schema_arrow
+    }
@@ -0,0 +1,233 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Checks the shapes of all arrays in a dataset (python -m shapeguard audit).
+
+Only file headers are read (see headers.READERS for the file types), and
+files are checked in parallel by a pool of processes (or threads). Each file
+gets its own ShapeGuard, so all arrays of a file share their dims. The dims
+of all files are merged at the end, and dims that differ between files are
+reported as conflicts. Dims that may differ between files should be private
+(e.g. "_H, _W, C").
+
+Usage:
+  python -m shapeguard audit DATA_DIR -r "*.npy=_H, _W, C" --report report.json
+  python -m shapeguard audit "data/**/*.npz" -r "*.npz:images=B, H, W, C" \\
+      -r "*.npz:labels=B" --dims C=3
+"""
+
+import argparse
+import concurrent.futures
+import fnmatch
+import glob
+import json
+import os
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from shapeguard import exception
+from shapeguard import headers
+from shapeguard.guard import ShapeGuard
+
+# (file pattern, key of the array (e.g. npz member or parquet column), template)
+Rule = Tuple[str, Optional[str], str]
+
+
+def parse_rule(rule: str) -> Rule:
+    """Parse "PATTERN[:KEY]=TEMPLATE" (e.g. "*.npz:images=B, H, W, C")."""
+    if "=" not in rule:
+        raise ValueError('Rule "{}" is not of the form PATTERN=TEMPLATE.'.format(rule))
+    pattern, template = rule.split("=", 1)
+    key = None
+    if ":" in pattern:
+        pattern, key = pattern.rsplit(":", 1)
+    return pattern.strip(), key, template.strip()
+
+
+def find_files(paths: Sequence[str]) -> Iterator[str]:
+    """Expand directories (recursively) and glob patterns into files."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        else:
+            for match in sorted(glob.glob(path, recursive=True)):
+                if os.path.isfile(match):
+                    yield match
+
+
+def matching_rules(path: str, rules: Sequence[Rule]) -> List[Rule]:
+    name = os.path.basename(path)
+    return [
+        r for r in rules if fnmatch.fnmatch(path, r[0]) or fnmatch.fnmatch(name, r[0])
+    ]
+
+
+def audit_file(
+    path: str, rules: Sequence[Rule], dims: Dict[str, Any]
+) -> Tuple[ShapeGuard, List[Dict[str, Any]], Optional[str]]:
+    """Check all arrays of path that have a rule.
+
+    Returns:
+      The ShapeGuard of the file, a list of violations and an error message
+      (or None) if the file could not be read.
+    """
+    sg = ShapeGuard(dims=dict(dims))
+    violations = []
+    shapes = None
+    try:
+        for _, key, template in rules:
+            if key is None:
+                shape = headers.file_shape(path)
+            else:
+                if shapes is None:  # read the headers only once
+                    shapes = headers.array_shapes(path)
+                shape = shapes[key]
+            result = sg.check(shape, template)
+            if result:
+                sg.guard(shape, template)  # store the inferred dims
+            else:
+                violations.append(
+                    {
+                        "file": path,
+                        "key": key,
+                        "template": template,
+                        "shape": shape,
+                        "message": result.message,
+                    }
+                )
+    except Exception as e:  # unreadable file, missing key, pending conflict...
+        return sg, violations, "{}: {}".format(type(e).__name__, e)
+    return sg, violations, None
+
+
+def audit(
+    paths: Sequence[str],
+    rules: Sequence[Rule],
+    dims: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+    threads: bool = False,
+) -> Dict[str, Any]:
+    """Audit all files under paths and return the report (see module docs)."""
+    dims = dims or {}
+    files = [(f, matching_rules(f, rules)) for f in find_files(paths)]
+    checked = [(f, r) for f, r in files if r]
+    executor_cls = (
+        concurrent.futures.ThreadPoolExecutor
+        if threads
+        else concurrent.futures.ProcessPoolExecutor
+    )
+    merged = ShapeGuard(dims=dict(dims))
+    violations: List[Dict[str, Any]] = []
+    errors: List[Dict[str, str]] = []
+    conflicts: Dict[str, Dict[str, Any]] = {}
+    with executor_cls(max_workers=workers) as executor:
+        results = executor.map(
+            audit_file,
+            [f for f, _ in checked],
+            [r for _, r in checked],
+            [dims] * len(checked),
+            **({} if threads else {"chunksize": 16})
+        )
+        for (path, _), (sg, file_violations, error) in zip(checked, results):
+            violations.extend(file_violations)
+            if error is not None:
+                errors.append({"file": path, "error": error})
+            try:
+                file_conflicts = merged.merge(sg, strict=False)
+            except exception.ShapeError as e:  # violates a pending constraint
+                errors.append({"file": path, "error": str(e)})
+                continue
+            for name, values in file_conflicts.items():
+                entry = conflicts.setdefault(name, {"values": [], "files": []})
+                entry["values"].extend(v for v in values if v not in entry["values"])
+                entry["files"].append(path)
+    return {
+        "files": len(files),
+        "checked": len(checked),
+        "dims": merged.dims,
+        "violations": violations,
+        "errors": errors,
+        "conflicts": conflicts,
+    }
+
+
+def _parse_dims(items: Sequence[str]) -> Dict[str, int]:
+    dims = {}
+    for item in items:
+        name, value = item.split("=", 1)
+        dims[name.strip()] = int(value)
+    return dims
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m shapeguard audit",
+        description="Check the shapes of array files from their headers.",
+    )
+    arg_parser.add_argument("path", nargs="+", help="directory or glob pattern")
+    arg_parser.add_argument(
+        "-r",
+        "--rule",
+        action="append",
+        default=[],
+        help='"PATTERN[:KEY]=TEMPLATE", e.g. "*.npz:images=B, H, W, C"',
+    )
+    arg_parser.add_argument(
+        "--config", help="JSON file with a {PATTERN[:KEY]: TEMPLATE} mapping"
+    )
+    arg_parser.add_argument(
+        "--dims", nargs="*", default=[], help="known dims, e.g. C=3"
+    )
+    arg_parser.add_argument("--workers", type=int, help="size of the pool")
+    arg_parser.add_argument(
+        "--threads", action="store_true", help="use threads instead of processes"
+    )
+    arg_parser.add_argument("--report", help="write the JSON report to this file")
+    args = arg_parser.parse_args(argv)
+
+    rules = [parse_rule(r) for r in args.rule]
+    if args.config:
+        with open(args.config) as f:
+            rules.extend(
+                parse_rule("{}={}".format(p, t)) for p, t in json.load(f).items()
+            )
+    if not rules:
+        arg_parser.error("at least one --rule or --config is required")
+
+    report = audit(args.path, rules, _parse_dims(args.dims), args.workers, args.threads)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    print(
+        "{} files, {} checked: {} violations, {} errors, {} conflicting dims".format(
+            report["files"],
+            report["checked"],
+            len(report["violations"]),
+            len(report["errors"]),
+            len(report["conflicts"]),
+        )
+    )
+    for v in report["violations"][:10]:
+        print("  {} ({}): {}".format(v["file"], v["template"], v["shape"]))
+    for e in report["errors"][:10]:
+        print("  {}: {}".format(e["file"], e["error"]))
+    for name, conflict in report["conflicts"].items():
+        print("  {} takes the values {}".format(name, conflict["values"]))
+    return int(bool(report["violations"] or report["errors"] or report["conflicts"]))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Dispatches tensor operations to the native implementation of each backend."""
+
+import sys
+from typing import List, Optional
+
+import numpy as np
+import tensorflow as tf
+
+from shapeguard import exception
+
+
+def is_torch(tensor) -> bool:
+    """Check for a torch.Tensor without importing torch."""
+    torch = sys.modules.get("torch")
+    return torch is not None and isinstance(tensor, torch.Tensor)
+
+
+def is_jax(tensor) -> bool:
+    """Check for a jax.Array (including tracers) without importing jax."""
+    jax = sys.modules.get("jax")
+    return jax is not None and isinstance(tensor, jax.Array)
+
+
+def is_shape_dtype_struct(obj) -> bool:
+    jax = sys.modules.get("jax")
+    return jax is not None and isinstance(obj, jax.ShapeDtypeStruct)
+
+
+def is_arrow(array) -> bool:
+    """Check for a pyarrow Array or ChunkedArray without importing pyarrow."""
+    pa = sys.modules.get("pyarrow")
+    return pa is not None and isinstance(array, (pa.Array, pa.ChunkedArray))
+
+
+def is_stored_array(array) -> bool:
+    """Check for an h5py.Dataset or zarr.Array without importing either."""
+    h5py = sys.modules.get("h5py")
+    if h5py is not None and isinstance(array, h5py.Dataset):
+        return True
+    zarr = sys.modules.get("zarr")
+    return zarr is not None and isinstance(array, zarr.Array)
+
+
+def chunk_shape(array) -> List[int]:
+    """Return the storage chunk shape of an h5py.Dataset or zarr.Array.
+
+    Contiguous (unchunked) HDF5 datasets are a single chunk.
+    """
+    if not is_stored_array(array):
+        raise TypeError("{} has no storage chunks.".format(type(array)))
+    if array.chunks is None:
+        return list(array.shape)
+    return list(array.chunks)
+
+
+def reshape(tensor, shape: List[Optional[int]], allow_copy: bool = True):
+    """Reshape tensor using the native reshape of its backend.
+
+    Numpy arrays are reshaped into views whenever their memory layout allows,
+    contiguous torch tensors with view.
+
+    Raises:
+      CopyRequiredError: if allow_copy is False but the reshape needs a copy.
+    """
+    if isinstance(tensor, np.ndarray):
+        if allow_copy:
+            return tensor.reshape(shape)
+        view = tensor.view()
+        try:
+            view.shape = shape
+        except AttributeError:
+            raise exception.CopyRequiredError(
+                "Reshaping array with shape {} and strides {} into {} requires "
+                "a copy.".format(tensor.shape, tensor.strides, shape)
+            )
+        return view
+    elif isinstance(tensor, (tf.Tensor, tf.Variable)):
+        return tf.reshape(tensor, shape)
+    elif is_torch(tensor):
+        if tensor.is_contiguous():
+            return tensor.view(shape)
+        elif allow_copy:
+            return tensor.reshape(shape)
+        try:
+            return tensor.view(shape)
+        except RuntimeError:
+            raise exception.CopyRequiredError(
+                "Reshaping tensor with shape {} and strides {} into {} requires "
+                "a copy.".format(list(tensor.shape), tensor.stride(), shape)
+            )
+    elif hasattr(tensor, "reshape"):
+        return tensor.reshape(shape)
+    else:
+        return tf.reshape(tensor, shape)
+
+
+def transpose(tensor, perm: List[int]):
+    if isinstance(tensor, (tf.Tensor, tf.Variable)):
+        return tf.transpose(tensor, perm)
+    elif is_torch(tensor):
+        return tensor.permute(perm)
+    elif is_jax(tensor):
+        return sys.modules["jax"].numpy.transpose(tensor, perm)
+    else:
+        return tensor.transpose(perm)
+
+
+TF_REDUCTIONS = {
+    "sum": tf.reduce_sum,
+    "mean": tf.reduce_mean,
+    "max": tf.reduce_max,
+    "min": tf.reduce_min,
+    "prod": tf.reduce_prod,
+}
+
+
+TORCH_REDUCTIONS = {"sum": "sum", "mean": "mean", "max": "amax", "min": "amin"}
+
+
+def reduce(tensor, axes: List[int], reduction: str):
+    if reduction not in TF_REDUCTIONS:
+        raise ValueError(
+            'Unknown reduction "{}". Use one of {}'.format(
+                reduction, sorted(TF_REDUCTIONS)
+            )
+        )
+    if isinstance(tensor, (tf.Tensor, tf.Variable)):
+        return TF_REDUCTIONS[reduction](tensor, axis=axes)
+    elif is_torch(tensor):
+        if reduction == "prod":  # torch.prod only reduces a single dim
+            for axis in sorted(axes, reverse=True):
+                tensor = tensor.prod(axis)
+            return tensor
+        return getattr(tensor, TORCH_REDUCTIONS[reduction])(tuple(axes))
+    elif is_jax(tensor):
+        jnp = sys.modules["jax"].numpy
+        return getattr(jnp, reduction)(tensor, axis=tuple(axes))
+    else:
+        return getattr(np, reduction)(tensor, axis=tuple(axes))
+
+
+def einsum(subscripts: str, *operands, optimize=False):
+    if any(isinstance(op, (tf.Tensor, tf.Variable)) for op in operands):
+        return tf.einsum(subscripts, *operands)
+    elif any(is_torch(op) for op in operands):
+        return sys.modules["torch"].einsum(subscripts, *operands)
+    elif any(is_jax(op) for op in operands):
+        return sys.modules["jax"].numpy.einsum(subscripts, *operands)
+    else:
+        return np.einsum(subscripts, *operands, optimize=optimize)
+
+
+def broadcast_to(tensor, shape: List[int]):
+    """Broadcast tensor (of the same rank as shape) to shape without copying.
+
+    Numpy arrays become read-only, stride-0 views and torch tensors are
+    expanded. tf.broadcast_to would materialize the tiled tensor, so TF
+    tensors are returned unchanged and their size-1 dims are left to the
+    implicit broadcasting of the ops they are used in.
+    """
+    if isinstance(tensor, np.ndarray):
+        return np.broadcast_to(tensor, shape)
+    elif is_torch(tensor):
+        return tensor.expand(shape)  # stride-0 view as well
+    elif is_jax(tensor):
+        return sys.modules["jax"].numpy.broadcast_to(tensor, shape)
+    else:
+        return tensor
+
+
+def pad(tensor, shape: List[int], value=0):
+    """Pad tensor at the end of each axis to the given (larger) shape.
+
+    Numpy arrays are copied once into a preallocated buffer, TF tensors are
+    padded with a single tf.pad.
+    """
+    if isinstance(tensor, np.ndarray):
+        padded = np.full(shape, value, dtype=tensor.dtype)
+        padded[tuple(slice(0, s) for s in tensor.shape)] = tensor
+        return padded
+    elif is_torch(tensor):
+        # torch pads the last axis first
+        paddings = [0] * (2 * len(shape))
+        for i, (s, t) in enumerate(zip(reversed(tensor.shape), reversed(shape))):
+            paddings[2 * i + 1] = t - s
+        return sys.modules["torch"].nn.functional.pad(tensor, paddings, value=value)
+    elif is_jax(tensor):
+        paddings = [(0, t - s) for s, t in zip(tensor.shape, shape)]
+        return sys.modules["jax"].numpy.pad(tensor, paddings, constant_values=value)
+    else:
+        paddings = [[0, t - s] for s, t in zip(tensor.shape, shape)]
+        return tf.pad(tensor, paddings, constant_values=value)
+
+
+def padding_mask(tensor, shape: List[int], padded_shape: List[int]):
+    """Boolean mask of the valid entries that broadcasts against the padded tensor.
+
+    Axes that were not padded have size 1 in the mask.
+    """
+    mask = np.ones([1] * len(shape), dtype=bool)
+    for axis, (s, t) in enumerate(zip(shape, padded_shape)):
+        if s != t:
+            axis_shape = [1] * len(shape)
+            axis_shape[axis] = t
+            mask = mask & (np.arange(t) < s).reshape(axis_shape)
+    if isinstance(tensor, np.ndarray):
+        return mask
+    elif is_torch(tensor):
+        return sys.modules["torch"].from_numpy(mask)
+    elif is_jax(tensor):
+        return sys.modules["jax"].numpy.asarray(mask)
+    else:
+        return tf.constant(mask)
@@ -0,0 +1,170 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Defines the store for constraints that cannot be checked yet."""
+
+from collections import ChainMap
+from typing import Dict, Iterable, List, Mapping, Set, Tuple
+
+from shapeguard import dim_specs
+from shapeguard import exception
+from shapeguard import shape_spec
+
+
+class Constraint:
+    """A template entry that could not be checked because of unknown dims."""
+
+    def __init__(
+        self, dim_spec: dim_specs.DimSpec, shape_entry: int, template: str, axis: int
+    ):
+        self.dim_spec = dim_spec
+        self.shape_entry = shape_entry
+        self.template = template
+        self.axis = axis
+
+    def __repr__(self) -> str:
+        return "<Constraint {} == {}>".format(self.dim_spec, self.shape_entry)
+
+
+class ConstraintStore:
+    """Records unresolved constraints and re-checks them as dims become known.
+
+    Every constraint is put on the watch list of each of its unknown dims, so
+    resolving a dim only re-evaluates the constraints that mention it.
+    Identical constraints (same entry and size) are only stored once.
+    """
+
+    def __init__(self):
+        self.constraints: Dict[int, Constraint] = {}
+        self.watchers: Dict[str, Set[int]] = {}
+        self._ids: Dict[Tuple[str, int], int] = {}
+        self._next_id = 0
+
+    def add(
+        self,
+        spec: shape_spec.ShapeSpec,
+        shape: List[int],
+        known_dims: Mapping[str, int],
+        template: str,
+    ) -> None:
+        """Record all entries of spec that cannot be checked under known_dims.
+
+        Entries that depend on private (underscore) dims are dropped, since
+        those dims are never stored and thus can never be resolved.
+        """
+        for axis, shape_entry, dim_spec in spec.axis_iter(shape):
+            if shape_entry is None:
+                continue
+            unknown = {n for n in dim_spec.names() if n not in known_dims}
+            if not unknown or any(n.startswith("_") for n in unknown):
+                continue
+            self._add(Constraint(dim_spec, shape_entry, template, axis), unknown)
+
+    def extend(
+        self, constraints: Iterable[Constraint], known_dims: Mapping[str, int]
+    ) -> Set[str]:
+        """Add constraints recorded by another store.
+
+        Returns:
+          Set[str]: names of the known dims that the added constraints depend
+            on. These have to be passed to resolve to re-check them.
+        """
+        names: Set[str] = set()
+        for constraint in constraints:
+            constraint_names = set(constraint.dim_spec.names())
+            self._add(constraint, constraint_names)
+            names.update(n for n in constraint_names if n in known_dims)
+        return names
+
+    def _add(self, constraint: Constraint, watched: Set[str]) -> None:
+        key = (repr(constraint.dim_spec), constraint.shape_entry)
+        if key in self._ids:
+            return  # e.g. the same template guarded in a loop
+        cid = self._next_id
+        self._next_id += 1
+        self.constraints[cid] = constraint
+        self._ids[key] = cid
+        for name in watched:
+            self.watchers.setdefault(name, set()).add(cid)
+
+    def resolve(
+        self, new_dims: Iterable[str], known_dims: Mapping[str, int]
+    ) -> Dict[str, int]:
+        """Re-evaluate the constraints that watch any of the new_dims.
+
+        The store is only modified if no constraint is violated.
+
+        Args:
+          new_dims: Iterable[str]. Names of the dims that just became known.
+          known_dims: Mapping[str, int]. All known dims (including new_dims).
+
+        Returns:
+          Dict[str, int]: dims that could be inferred from the constraints.
+
+        Raises:
+          ShapeError: if a constraint is violated.
+        """
+        inferred: Dict[str, int] = {}
+        current_known = ChainMap(inferred, known_dims)
+        done: Set[str] = set()
+        resolved: Set[int] = set()
+        queue = list(new_dims)
+        while queue:
+            name = queue.pop()
+            if name in done:
+                continue
+            done.add(name)
+            for cid in self.watchers.get(name, ()):
+                constraint = self.constraints.get(cid)
+                if constraint is None or cid in resolved:
+                    continue  # already resolved through another dim
+                spec, entry = constraint.dim_spec, constraint.shape_entry
+                new = spec.infer(entry, current_known)
+                inferred.update(new)
+                queue.extend(new)
+                if any(n not in current_known for n in spec.names()):
+                    continue
+                resolved.add(cid)
+                if spec.has_conflict(entry, current_known):
+                    raise exception.ShapeError(
+                        "Shape Mismatch\n"
+                        "Constraint {} == {} (axis {} of template {}) is violated.\n"
+                        "Known dimensions: {}".format(
+                            spec,
+                            entry,
+                            constraint.axis,
+                            constraint.template,
+                            dict(current_known),
+                        )
+                    )
+        for name in done:
+            self.watchers.pop(name, None)
+        for cid in resolved:
+            constraint = self.constraints.pop(cid)
+            del self._ids[(repr(constraint.dim_spec), constraint.shape_entry)]
+        return inferred
+
+    def copy(self) -> "ConstraintStore":
+        store = ConstraintStore()
+        store.constraints = dict(self.constraints)
+        store.watchers = {n: set(cids) for n, cids in self.watchers.items()}
+        store._ids = dict(self._ids)
+        store._next_id = self._next_id
+        return store
+
+    def __len__(self) -> int:
+        return len(self.constraints)
+
+    def __iter__(self):
+        return iter(self.constraints.values())
@@ -14,8 +14,9 @@
 
 """Defines all DimSpecs which represent individual dimensions of a ShapeSpec"""
 
+import functools
 import operator
-from typing import Optional, Dict, Callable, TypeVar, Generic, Any, Union
+from typing import Optional, Dict, Callable, TypeVar, Generic, Any, Union, Tuple
 from shapeguard import exception
 
 
@@ -99,6 +100,14 @@ class DimSpec:
         """Iterate all multiplicative sub-components of this dimension."""
         yield self
 
+    def names(self):
+        """Iterate the names of all named dimensions used in this dimension."""
+        return iter(())
+
+    def base(self) -> "DimSpec":
+        """Return this dimension without any range or divisibility constraints."""
+        return self
+
     def __repr__(self) -> str:
         return "<DimSpec>"
 
@@ -135,6 +144,39 @@ class EllipsisDim(DimSpec):
 ellipsis_dim = EllipsisDim.make()
 
 
+class NamedEllipsisDim(EllipsisDim):
+    """Represents zero or more dimensions that are bound to a name (as tuple)."""
+
+    @classmethod
+    def make(cls, children=()):
+        return cls(*children)
+
+    def __init__(self, name):
+        super(NamedEllipsisDim, self).__init__()
+        self.name = str(name)
+
+    def evaluate(self, known_dims: Dict[str, Any]) -> Tuple[int, ...]:
+        if self.name in known_dims:
+            return tuple(known_dims[self.name])
+        raise exception.UnderspecifiedShapeError(
+            'Unknown dimensions "*{}"\nKnown dimensions: {}'.format(
+                self.name, known_dims
+            )
+        )
+
+    def names(self):
+        yield self.name
+
+    def __repr__(self) -> str:
+        return "*" + self.name
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, NamedEllipsisDim):
+            return False
+        else:
+            return self.name == other.name
+
+
 class Wildcard(DimSpec):
     """Represents a dimension with any size."""
 
@@ -231,6 +273,9 @@ class NamedDim(DimSpec):
         else:
             return {self.name: shape_entry}
 
+    def names(self):
+        yield self.name
+
     def __repr__(self):
         return self.name
 
@@ -271,6 +316,53 @@ class DynamicNamedDim(NamedDim):
             return self.name == other.name
 
 
+class RaggedDim(DynamicNamedDim):
+    """Represents a ragged dimension (None in the shape of a RaggedTensor).
+
+    If the dimension is uniform (e.g. for a dense tensor), it behaves like a
+    named dimension.
+    """
+
+    def __repr__(self):
+        return "ragged({})".format(self.name)
+
+
+class ProdDim(DimSpec):
+    """Represents the product of the dimensions bound to a named ellipsis."""
+
+    def __init__(self, name):
+        super(ProdDim, self).__init__()
+        self.name = str(name)
+
+    def has_conflict(
+        self, shape_entry: Optional[int], known_dims: Dict[str, Any]
+    ) -> bool:
+        if shape_entry is None or self.name not in known_dims:
+            return False
+        return self.evaluate(known_dims) != shape_entry
+
+    def evaluate(self, known_dims: Dict[str, Any]) -> Optional[int]:
+        if self.name in known_dims:
+            return functools.reduce(operator.mul, known_dims[self.name], 1)
+        raise exception.UnderspecifiedShapeError(
+            'Unknown dimensions "*{}"\nKnown dimensions: {}'.format(
+                self.name, known_dims
+            )
+        )
+
+    def names(self):
+        yield self.name
+
+    def __repr__(self):
+        return "prod({})".format(self.name)
+
+    def __eq__(self, other):
+        if not isinstance(other, ProdDim):
+            return False
+        else:
+            return self.name == other.name
+
+
 class OpSpec(DimSpec):
     """Baseclass for dimension operations."""
 
@@ -281,6 +373,11 @@ class OpSpec(DimSpec):
 
     def __init__(self, left, right):
         super(OpSpec, self).__init__()
+        # within expressions "ragged(T)" is just the name
+        if isinstance(left, RaggedDim):
+            left = NamedDim(left.name)
+        if isinstance(right, RaggedDim):
+            right = NamedDim(right.name)
         self.left: DimSpec = left
         self.right: DimSpec = right
 
@@ -290,6 +387,8 @@ class OpSpec(DimSpec):
     def infer(
         self, shape_entry: Optional[int], known_dims: Dict[str, int]
     ) -> Dict[str, int]:
+        if shape_entry is None:
+            return {}
         try:
             left_val = self.left.evaluate(known_dims)
             right_val = self.right_op(shape_entry, left_val)
@@ -332,6 +431,12 @@ class OpSpec(DimSpec):
         else:
             yield self
 
+    def names(self):
+        for n in self.left.names():
+            yield n
+        for n in self.right.names():
+            yield n
+
 
 class AddDims(OpSpec):
     """Represents addition of two dimension values."""
@@ -367,3 +472,125 @@ class DivDims(OpSpec):
     op = operator.floordiv
     left_op = operator.mul
     right_op = operator.floordiv
+
+
+class BoundedDim(DimSpec):
+    """Baseclass for a dimension with a constraint on its size (e.g. T<=4096).
+
+    The constraint is checked against the shape entry, so rejecting an
+    oversized dimension costs a single comparison. Otherwise it behaves like
+    the constrained dimension.
+    """
+
+    op_str: str = "#"
+    op: BinaryOperator
+
+    def __init__(self, dim, bound):
+        super(BoundedDim, self).__init__()
+        self.dim: DimSpec = dim
+        self.bound: DimSpec = bound
+
+    def is_satisfied(self, value: int, known_dims: Dict[str, int]) -> bool:
+        try:
+            return self.op(value, self.bound.evaluate(known_dims))
+        except exception.UnderspecifiedShapeError:
+            return True  # cannot be decided yet
+
+    def has_conflict(
+        self, shape_entry: Optional[int], known_dims: Dict[str, int]
+    ) -> bool:
+        if self.dim.has_conflict(shape_entry, known_dims):
+            return True
+        if shape_entry is None:
+            return False
+        return not self.is_satisfied(shape_entry, known_dims)
+
+    def evaluate(self, known_dims: Dict[str, int]) -> Optional[int]:
+        return self.dim.evaluate(known_dims)
+
+    def infer(
+        self, shape_entry: Optional[int], known_dims: Dict[str, int]
+    ) -> Dict[str, int]:
+        return self.dim.infer(shape_entry, known_dims)
+
+    def names(self):
+        for n in self.dim.names():
+            yield n
+        for n in self.bound.names():
+            yield n
+
+    def base(self) -> DimSpec:
+        return self.dim.base()
+
+    def __eq__(self, other):
+        if not isinstance(other, type(self)):
+            return False
+        else:
+            return self.dim == other.dim and self.bound == other.bound
+
+    def __repr__(self):
+        return "{}{}{}".format(self.dim, self.op_str, self.bound)
+
+
+class LessThan(BoundedDim):
+    """Represents a dimension with an exclusive upper bound."""
+
+    op_str = "<"
+    op = operator.lt
+
+
+class LessEqual(BoundedDim):
+    """Represents a dimension with an inclusive upper bound."""
+
+    op_str = "<="
+    op = operator.le
+
+
+class GreaterThan(BoundedDim):
+    """Represents a dimension with an exclusive lower bound."""
+
+    op_str = ">"
+    op = operator.gt
+
+
+class GreaterEqual(BoundedDim):
+    """Represents a dimension with an inclusive lower bound."""
+
+    op_str = ">="
+    op = operator.ge
+
+
+class Divisible(BoundedDim):
+    """Represents a dimension with a fixed remainder (e.g. D%8==0)."""
+
+    def __init__(self, dim, divisor, remainder):
+        super(Divisible, self).__init__(dim, divisor)
+        self.remainder: DimSpec = remainder
+        if isinstance(divisor, Number) and divisor.value == 0:
+            raise ValueError('Divisor of "{}" must not be 0.'.format(self))
+
+    def is_satisfied(self, value: int, known_dims: Dict[str, int]) -> bool:
+        try:
+            divisor = self.bound.evaluate(known_dims)
+            remainder = self.remainder.evaluate(known_dims)
+        except exception.UnderspecifiedShapeError:
+            return True  # cannot be decided yet
+        if divisor == 0:
+            raise ValueError(
+                'Divisor of "{}" is 0\nKnown dimensions: {}'.format(self, known_dims)
+            )
+        return value % divisor == remainder
+
+    def names(self):
+        for n in super(Divisible, self).names():
+            yield n
+        for n in self.remainder.names():
+            yield n
+
+    def __eq__(self, other):
+        return super(Divisible, self).__eq__(other) and (
+            self.remainder == other.remainder
+        )
+
+    def __repr__(self):
+        return "{}%{}=={}".format(self.dim, self.bound, self.remainder)
@@ -0,0 +1,239 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Selects code paths by matching a shape against a set of templates."""
+
+import re
+import warnings
+from collections import Counter
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+from shapeguard import dim_specs
+from shapeguard import exception
+from shapeguard import parser
+from shapeguard import tools
+
+
+class Alternative:
+    """A single template of a ShapeDispatcher together with its function."""
+
+    def __init__(self, template: str, fn: Callable):
+        self.template = template
+        self.fn = fn
+        self.spec = parser.parse(template)
+        self.min_rank = len(self.spec.left_entries) + len(self.spec.right_entries)
+
+    def rank_matches(self, rank: int) -> bool:
+        if self.spec.has_ellipsis:
+            return rank >= self.min_rank
+        return rank == self.min_rank
+
+    def entries_at(self, rank: int) -> Dict[int, dim_specs.DimSpec]:
+        """Map the axes of a shape with the given rank to the entries."""
+        entries = dict(enumerate(self.spec.left_entries))
+        offset = rank - len(self.spec.right_entries)
+        entries.update((offset + i, e) for i, e in enumerate(self.spec.right_entries))
+        return entries
+
+    def constants_at(self, rank: int) -> Dict[int, int]:
+        return {
+            axis: e.value
+            for axis, e in self.entries_at(rank).items()
+            if isinstance(e, dim_specs.Number)
+        }
+
+    def equalities_at(self, rank: int) -> List[Tuple[int, int]]:
+        """Pairs of axes that have to be equal because they share a name."""
+        first_axis: Dict[str, int] = {}
+        equalities = []
+        for axis, e in sorted(self.entries_at(rank).items()):
+            if type(e) is dim_specs.NamedDim:
+                if e.name in first_axis:
+                    equalities.append((first_axis[e.name], axis))
+                else:
+                    first_axis[e.name] = axis
+        return equalities
+
+    def canonical(self) -> str:
+        """Template representation that is independent of the dim names."""
+        renamed: Dict[str, str] = {}
+        for e in self.spec.entries:
+            for name in e.names():
+                renamed.setdefault(name, "_{}".format(len(renamed)))
+        return re.sub(
+            r"[A-Za-z_]\w*", lambda m: renamed.get(m.group(), m.group()), repr(self)
+        )
+
+    def __repr__(self) -> str:
+        return repr(self.spec.entries)
+
+
+class Leaf:
+    def __init__(self, alternatives: List[Alternative], rank: int):
+        self.alternatives = [(a, a.equalities_at(rank)) for a in alternatives]
+
+    def lookup(self, shape: List[int], dims: Dict[str, int]):
+        for alternative, equalities in self.alternatives:
+            if any(shape[i] != shape[j] for i, j in equalities):
+                continue
+            result = tools.check_spec(
+                shape, alternative.spec, dims, alternative.template
+            )
+            if result:
+                return alternative.fn, result.dims
+        return None
+
+
+class Node:
+    def __init__(self, axis: int, branches: Dict[int, "TreeType"], default: "TreeType"):
+        self.axis = axis
+        self.branches = branches
+        self.default = default
+
+    def lookup(self, shape: List[int], dims: Dict[str, int]):
+        branch = self.branches.get(shape[self.axis], self.default)
+        return branch.lookup(shape, dims)
+
+
+TreeType = Union[Node, Leaf]
+
+
+def build_tree(alternatives: List[Alternative], rank: int) -> TreeType:
+    """Build a discrimination tree over the constant entries of alternatives.
+
+    Each node switches on the axis that has a constant in most alternatives.
+    Alternatives without a constant on that axis end up in every branch, and
+    the order of the alternatives is preserved in all of them, so the first
+    matching template always wins.
+    """
+    constants = [(a, a.constants_at(rank)) for a in alternatives]
+
+    def build(candidates, used_axes) -> TreeType:
+        counts = Counter(
+            axis for _, c in candidates for axis in c if axis not in used_axes
+        )
+        if not counts:
+            return Leaf([a for a, _ in candidates], rank)
+        axis = counts.most_common(1)[0][0]
+        used = used_axes | {axis}
+        branches = {
+            value: build(
+                [(a, c) for a, c in candidates if c.get(axis, value) == value], used
+            )
+            for value in {c[axis] for _, c in candidates if axis in c}
+        }
+        default = build([(a, c) for a, c in candidates if axis not in c], used)
+        return Node(axis, branches, default)
+
+    return build(constants, frozenset())
+
+
+def may_overlap(a: Alternative, b: Alternative) -> bool:
+    """Conservatively determine if some shape could match both alternatives.
+
+    Only the rank, the constant entries and the axes that have to be equal
+    because they share a name are taken into account (e.g. "N, N" and "3, 4"
+    cannot overlap). Arithmetic entries like "2*K" may match any size.
+    """
+    if a.spec.has_ellipsis and b.spec.has_ellipsis:
+        # collisions are fewest if left and right entries cannot interact
+        rank = a.min_rank + b.min_rank
+    elif a.spec.has_ellipsis or b.spec.has_ellipsis:
+        rank = b.min_rank if a.spec.has_ellipsis else a.min_rank
+    else:
+        rank = a.min_rank
+    if not (a.rank_matches(rank) and b.rank_matches(rank)):
+        return False
+    # group axes that have to be equal and check that no group needs two sizes
+    group = list(range(rank))
+
+    def find(axis: int) -> int:
+        while group[axis] != axis:
+            axis = group[axis]
+        return axis
+
+    for i, j in a.equalities_at(rank) + b.equalities_at(rank):
+        group[find(j)] = find(i)
+    constants = list(a.constants_at(rank).items())
+    constants += b.constants_at(rank).items()
+    sizes: Dict[int, int] = {}
+    for axis, v in constants:
+        if sizes.setdefault(find(axis), v) != v:
+            return False
+    return True
+
+
+class ShapeDispatcher:
+    """Picks the function of the first template that matches a given shape.
+
+    All templates are parsed once and compiled (lazily per rank) into a
+    discrimination tree on their constant entries. Equivalent templates
+    raise an AmbiguousTemplateError and overlapping templates issue a
+    warning at build time. They are also listed in the `overlaps` attribute.
+    """
+
+    def __init__(self, table: Mapping[str, Callable], warn_overlaps: bool = True):
+        self.alternatives = [Alternative(t, fn) for t, fn in table.items()]
+        self.overlaps: List[Tuple[str, str]] = []
+        self._trees: Dict[int, TreeType] = {}
+        seen: Dict[str, str] = {}
+        for i, a in enumerate(self.alternatives):
+            canonical = a.canonical()
+            if canonical in seen:
+                raise exception.AmbiguousTemplateError(
+                    'Templates "{}" and "{}" are equivalent.'.format(
+                        seen[canonical], a.template
+                    )
+                )
+            seen[canonical] = a.template
+            for b in self.alternatives[:i]:
+                if may_overlap(a, b):
+                    self.overlaps.append((b.template, a.template))
+        if self.overlaps and warn_overlaps:
+            warnings.warn(
+                "Overlapping templates (the first one takes precedence): {}".format(
+                    self.overlaps
+                ),
+                stacklevel=3,
+            )
+
+    def lookup(
+        self, tensor, dims: Optional[Dict[str, int]] = None
+    ) -> Optional[Tuple[Callable, Dict[str, int]]]:
+        """Return the function and the inferred dims of the first match or None."""
+        shape = tools.get_shape(tensor)
+        rank = len(shape)
+        if rank not in self._trees:
+            self._trees[rank] = build_tree(
+                [a for a in self.alternatives if a.rank_matches(rank)], rank
+            )
+        return self._trees[rank].lookup(shape, dims or {})
+
+    def __call__(
+        self, tensor, dims: Optional[Dict[str, int]] = None
+    ) -> Tuple[Callable, Dict[str, int]]:
+        match = self.lookup(tensor, dims)
+        if match is None:
+            raise exception.ShapeError(
+                "Shape {} matches none of the templates {}".format(
+                    tools.get_shape(tensor), [a.template for a in self.alternatives]
+                )
+            )
+        return match
+
+
+def dispatch(
+    table: Mapping[str, Callable], warn_overlaps: bool = True
+) -> ShapeDispatcher:
+    return ShapeDispatcher(table, warn_overlaps)
@@ -14,6 +14,8 @@
 
 """Defines all custom ShapeGuard errors."""
 
+from typing import Dict, List
+
 
 class ShapeGuardError(Exception):
     """Baseclass for all custom ShapeGuard errors."""
@@ -27,3 +29,27 @@ class ShapeError(ShapeGuardError):
 
 class UnderspecifiedShapeError(ShapeGuardError):
     pass
+
+
+class AmbiguousTemplateError(ShapeGuardError):
+    pass
+
+
+class CopyRequiredError(ShapeGuardError):
+    pass
+
+
+class DimConflictError(ShapeError):
+    """Raised when merging ShapeGuards that disagree about some dims."""
+
+    def __init__(self, message: str, conflicts: Dict[str, List[int]]):
+        super().__init__(message)
+        self.conflicts = conflicts
+
+
+class RowConstraintError(ShapeError):
+    """Raised when some rows of ragged data violate a row constraint."""
+
+    def __init__(self, message: str, rows):
+        super().__init__(message)
+        self.rows = rows
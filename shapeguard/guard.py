@@ -14,32 +14,263 @@
 
 """Contains the main ShapeGuard class."""
 
-from copy import copy
-from typing import Optional, Dict, Any, List
+from collections import ChainMap
+from typing import Optional, Dict, Any, List, Iterable, Mapping, TYPE_CHECKING
 
+import numpy as np
+import tensorflow as tf
+
+from shapeguard import constraints
+from shapeguard import exception
+from shapeguard import padding
+from shapeguard import parser
+from shapeguard import plans
+from shapeguard import rows
+from shapeguard import shape_spec
 from shapeguard import tools
 
+if TYPE_CHECKING:  # avoid importing trace when running it as a script
+    from shapeguard import trace
+
 
 class ShapeGuard:
-    def __init__(self, dims: Optional[Dict[str, int]] = None):
+    def __init__(
+        self,
+        dims: Optional[Dict[str, int]] = None,
+        recorder: Optional["trace.TraceRecorder"] = None,
+        symbolic: bool = False,
+    ):
         object.__setattr__(self, "dims", {} if dims is None else dims)
+        object.__setattr__(self, "pending", constraints.ConstraintStore())
+        object.__setattr__(self, "recorder", recorder)
+        # all values seen for dims that conflicted in non-strict merges
+        object.__setattr__(self, "conflicts", {})
+        # dims that are only known as tf.shape scalars (if symbolic)
+        object.__setattr__(self, "symbolic_dims", {} if symbolic else None)
 
     def matches(self, tensor, template: str) -> bool:
         return tools.matches(tensor, template, self.dims)
 
-    def guard(self, tensor, template: str):
-        inferred_dims = tools.guard(tensor, template, self.dims)
-        self.dims.update(inferred_dims)
+    def check(self, tensor, template: str) -> tools.CheckResult:
+        return tools.check(tensor, template, self.dims)
+
+    def guard(self, tensor, template: str, refine_shape: bool = False):
+        """Check the shape of tensor against template and store inferred dims.
+
+        Args:
+          tensor: the tensor to check.
+          template: str. The shape template.
+          refine_shape: bool. If True, set the dynamic (None) dims of the
+            static shape of a TF tensor to their values under the known dims.
+            This uses set_shape, so it adds no runtime check.
+
+        Returns:
+          The (same) tensor.
+        """
+        return self._guard_spec(tensor, parser.parse(template), template, refine_shape)
+
+    def _guard_spec(
+        self,
+        tensor,
+        spec: shape_spec.ShapeSpec,
+        template: str,
+        refine_shape: bool = False,
+    ):
+        result = tools.check_spec(tools.get_shape(tensor), spec, self.dims, template)
+        if not result:
+            raise exception.ShapeError(result.message)
+        self._update_dims({k: v for k, v in result.dims.items() if k not in self.dims})
+        # remember relations that cannot be checked yet (e.g. "B*T")
+        self.pending.add(result.spec, result.shape, self.dims, template)
+        if (
+            self.symbolic_dims is not None
+            and isinstance(tensor, tf.Tensor)
+            and None in result.shape
+        ):
+            self._bind_symbolic_dims(tensor, spec, result.shape)
+        if self.recorder is not None:
+            self.recorder.record(spec, template, result.shape, result.dims)
+        if refine_shape and isinstance(tensor, tf.Tensor) and None in result.shape:
+            tensor.set_shape(tools.refined_shape(spec, result.shape, self.dims))
         return tensor
 
-    def reshape(self, tensor, template: str):
-        return tools.reshape(tensor, template, self.dims)
+    def reshape(self, tensor, template: str, allow_copy: bool = True):
+        return tools.reshape(tensor, template, self._all_dims(), allow_copy)
+
+    def rearrange(self, tensor, pattern: str, reduction: Optional[str] = None):
+        plan = plans.rearrange_plan(pattern)
+        self._guard_spec(tensor, plan.input_spec, plan.input_template)
+        # unlike the stored dims, these include private dims (e.g. "_B")
+        known_dims = plan.input_spec.infer(tools.get_shape(tensor), self.dims)
+        return plan.apply(tensor, known_dims, reduction)
+
+    def einsum(self, pattern: str, *operands):
+        plan = plans.einsum_plan(pattern)
+        for op, spec, template in plan.inputs(operands):
+            self._guard_spec(op, spec, template)
+        return plan.apply(*operands)
+
+    def expand(self, tensor, source: str, target: str):
+        plan = plans.broadcast_plan(source, target)
+        self._guard_spec(tensor, plan.source_spec, source)
+        return plan.expand(tensor, tools.get_shape(tensor))
+
+    def broadcast(self, tensor, source: str, target: str):
+        plan = plans.broadcast_plan(source, target)
+        self._guard_spec(tensor, plan.source_spec, source)
+        return plan.broadcast(tensor, tools.get_shape(tensor), self.dims)
+
+    def pad_to_bucket(
+        self,
+        tensor,
+        template: str,
+        buckets: Optional[padding.Buckets] = None,
+        multiple_of: Optional[Dict[str, int]] = None,
+        value=0,
+    ):
+        """Guard tensor and pad it to a bucketed shape (see padding.pad_to_bucket).
+
+        The bucketed dims vary between calls and are therefore not stored.
+        """
+        spec = parser.parse(template)
+        result = tools.check_spec(tools.get_shape(tensor), spec, self.dims, template)
+        if not result:
+            raise exception.ShapeError(result.message)
+        buckets = buckets or {}
+        self._update_dims(
+            {
+                k: v
+                for k, v in result.dims.items()
+                if k not in buckets and k not in self.dims
+            }
+        )
+        return padding.pad_spec(tensor, spec, result.dims, buckets, multiple_of, value)
+
+    def check_rows(self, constraints, row_dims) -> rows.RowCheckResult:
+        """Check per-row constraints under the known dims (see rows.check_rows)."""
+        return rows.check_rows(constraints, row_dims, self.dims)
+
+    def guard_rows(self, constraints, row_dims) -> None:
+        """Like check_rows, but raises on violations (see rows.guard_rows)."""
+        rows.guard_rows(constraints, row_dims, self.dims)
+
+    def guard_chunks(self, array, template: str, aligned: bool = False):
+        """Check the storage chunks of array (see tools.guard_chunks).
+
+        Guard the shape of the array first, so its dims are known.
+        """
+        tools.guard_chunks(array, template, self.dims, aligned)
+        return array
 
     def evaluate(self, template: str, **kwargs) -> List[Optional[int]]:
-        local_dims = copy(self.dims)
+        local_dims = dict(self._all_dims())
         local_dims.update(kwargs)
         return tools.evaluate(template, local_dims)
 
+    def tensor_spec(self, template: str, dtype=tf.float32, name=None):
+        return tools.tensor_spec(template, self.dims, dtype, name)
+
+    def shape_dtype_struct(self, template: str, dtype=np.float32):
+        return tools.shape_dtype_struct(template, self.dims, dtype)
+
+    def function(self, *templates, dtype=tf.float32, **kwargs):
+        """Decorator for a tf.function with an input_signature from templates.
+
+        Args:
+          *templates: one template (or a (template, dtype) pair) per argument.
+          dtype: default dtype of the arguments.
+          **kwargs: passed on to tf.function.
+        """
+        signature = tools.input_signature(templates, self.dims, dtype)
+        return tf.function(input_signature=signature, **kwargs)
+
+    def merge(self, *others: "ShapeGuard", strict: bool = True) -> Dict[str, List[int]]:
+        """Merge the dims and pending constraints of others into this guard.
+
+        Args:
+          *others: ShapeGuards to merge (e.g. unpickled from worker processes).
+          strict: bool. If True raise a DimConflictError on conflicts.
+            Otherwise conflicting dims keep their current value and are also
+            added to the conflicts attribute.
+
+        Returns:
+          Dict[str, List[int]]: all values seen for each conflicting dim.
+
+        Raises:
+          DimConflictError: if strict and the guards disagree about some dims.
+        """
+        new_dims: Dict[str, int] = {}
+        current_dims = ChainMap(new_dims, self.dims)
+        conflicts: Dict[str, List[int]] = {}
+        for other in others:
+            for name, value in other.dims.items():
+                if name not in current_dims:
+                    new_dims[name] = value
+                elif current_dims[name] != value:
+                    values = conflicts.setdefault(name, [current_dims[name]])
+                    if value not in values:
+                        values.append(value)
+        if conflicts and strict:
+            raise exception.DimConflictError(
+                "Conflicting dimensions: {}".format(conflicts), conflicts
+            )
+        # merge into a copy, so a violated constraint leaves this guard unchanged
+        merged = ShapeGuard(dict(self.dims))
+        object.__setattr__(merged, "pending", self.pending.copy())
+        merged._update_dims(new_dims)
+        for other in others:
+            names = merged.pending.extend(other.pending, merged.dims)
+            merged.dims.update(merged.pending.resolve(names, merged.dims))
+        self.dims.clear()
+        self.dims.update(merged.dims)
+        object.__setattr__(self, "pending", merged.pending)
+        for name, values in conflicts.items():
+            seen = self.conflicts.setdefault(name, [])
+            seen.extend(v for v in values if v not in seen)
+        return conflicts
+
+    @classmethod
+    def merge_all(
+        cls, guards: Iterable["ShapeGuard"], strict: bool = True
+    ) -> "ShapeGuard":
+        """Return a new ShapeGuard that merges all guards (see merge).
+
+        If not strict, the conflicts are reported in its conflicts attribute.
+        """
+        merged = cls()
+        merged.merge(*guards, strict=strict)
+        return merged
+
+    def _all_dims(self) -> Mapping[str, Any]:
+        """Static dims, falling back to symbolic ones (if any)."""
+        if self.symbolic_dims:
+            return ChainMap(self.dims, self.symbolic_dims)
+        return self.dims
+
+    def _bind_symbolic_dims(self, tensor, spec: shape_spec.ShapeSpec, shape):
+        # symbolic dims of other graphs (e.g. from an earlier trace) are stale
+        for name, value in list(self.symbolic_dims.items()):
+            if value.graph is not tensor.graph:
+                del self.symbolic_dims[name]
+        known_dims = ChainMap(self.dims, self.symbolic_dims)
+        self.symbolic_dims.update(
+            tools.bind_symbolic_dims(tensor, spec, shape, known_dims)
+        )
+
+    def _update_dims(self, new_dims: Dict[str, int]):
+        # dims are only stored if they violate no pending constraint
+        inferred_dims = self.pending.resolve(new_dims, ChainMap(new_dims, self.dims))
+        self.dims.update(new_dims)
+        self.dims.update(inferred_dims)
+
+    def __getstate__(self):
+        return self.dims, list(self.pending)
+
+    def __setstate__(self, state):
+        dims, pending = state
+        self.__init__(dims)
+        self.pending.extend(pending, dims)
+
     def __getitem__(self, item: str) -> List[Optional[int]]:
         return tools.evaluate(item, self.dims)
 
@@ -59,7 +290,7 @@ class ShapeGuard:
             object.__getattribute__(self, key)
         except AttributeError:
             try:
-                self.dims[key] = value
+                self._update_dims({key: value})
             except KeyError:
                 raise AttributeError(key)
         else:
@@ -0,0 +1,219 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Reads array shapes from file headers without loading the data."""
+
+import os
+import struct
+import zipfile
+from collections import namedtuple
+from typing import BinaryIO, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from shapeguard import arrow
+
+PathType = Union[str, os.PathLike]
+Shape = List[Optional[int]]
+
+ArrayHeader = namedtuple("ArrayHeader", ["shape", "dtype", "fortran_order"])
+
+
+def read_npy_header(f: BinaryIO) -> ArrayHeader:
+    """Read the header of an .npy file object (a few hundred bytes)."""
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+    else:  # 2.0 and 3.0 only differ in the encoding of the (ascii) keys
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+    return ArrayHeader(list(shape), dtype, fortran_order)
+
+
+def npy_header(path: PathType) -> ArrayHeader:
+    with open(path, "rb") as f:
+        return read_npy_header(f)
+
+
+def npz_headers(path: PathType) -> Dict[str, ArrayHeader]:
+    """Read the headers of all arrays in an .npz file (compressed or not).
+
+    Only the zip directory and the beginning of each member are read.
+    """
+    headers = {}
+    with zipfile.ZipFile(path) as archive:
+        for name in archive.namelist():
+            if not name.endswith(".npy"):
+                continue
+            with archive.open(name) as f:
+                headers[name[: -len(".npy")]] = read_npy_header(f)
+    return headers
+
+
+# channels of each PNG color type (palette images decode to RGB)
+PNG_CHANNELS = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}
+
+# start of frame markers (all except DHT, JPG and DAC)
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _read_exactly(f: BinaryIO, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Unexpected end of file.")
+    return data
+
+
+def png_shape(f: BinaryIO) -> Shape:
+    """Read [height, width, channels] from the IHDR chunk of a PNG file."""
+    header = _read_exactly(f, 26)
+    if header[:8] != b"\x89PNG\r\n\x1a\n" or header[12:16] != b"IHDR":
+        raise ValueError("Not a PNG file.")
+    width, height, _, color_type = struct.unpack(">IIBB", header[16:26])
+    if color_type not in PNG_CHANNELS:
+        raise ValueError("Unknown PNG color type {}.".format(color_type))
+    return [height, width, PNG_CHANNELS[color_type]]
+
+
+def jpeg_shape(f: BinaryIO) -> Shape:
+    """Read [height, width, channels] from the start of frame of a JPEG file.
+
+    Only the marker segments before the frame header are read (skipping
+    their contents), never the compressed data.
+    """
+    if _read_exactly(f, 2) != b"\xff\xd8":
+        raise ValueError("Not a JPEG file.")
+    while True:
+        marker = _read_exactly(f, 2)
+        while marker[1] == 0xFF:  # fill bytes
+            marker = marker[1:] + _read_exactly(f, 1)
+        if marker[0] != 0xFF:
+            raise ValueError("Corrupt JPEG marker.")
+        (length,) = struct.unpack(">H", _read_exactly(f, 2))
+        if marker[1] in JPEG_SOF_MARKERS:
+            _, height, width, channels = struct.unpack(">BHHB", _read_exactly(f, 6))
+            return [height, width, channels]
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def gif_shape(f: BinaryIO) -> Shape:
+    """Read [height, width, 3] from the logical screen of a GIF file.
+
+    The number of frames is not part of the header.
+    """
+    header = _read_exactly(f, 10)
+    if header[:6] not in (b"GIF87a", b"GIF89a"):
+        raise ValueError("Not a GIF file.")
+    width, height = struct.unpack("<HH", header[6:10])
+    return [height, width, 3]
+
+
+def wav_shape(f: BinaryIO) -> Shape:
+    """Read [frames, channels] from the fmt and data chunks of a WAV file."""
+    header = _read_exactly(f, 12)
+    if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise ValueError("Not a WAV file.")
+    channels = block_align = None
+    while True:
+        chunk_id, size = struct.unpack("<4sI", _read_exactly(f, 8))
+        if chunk_id == b"fmt ":
+            if size < 14:
+                raise ValueError("WAV fmt chunk too short ({} bytes).".format(size))
+            fmt = _read_exactly(f, size + size % 2)
+            channels, _, _, block_align = struct.unpack("<HIIH", fmt[2:14])
+        elif chunk_id == b"data":
+            if block_align is None:
+                raise ValueError("WAV data chunk before fmt chunk.")
+            if block_align == 0:
+                raise ValueError("WAV fmt chunk has a block align of 0.")
+            return [size // block_align, channels]
+        else:
+            f.seek(size + size % 2, os.SEEK_CUR)  # chunks are padded to 2 bytes
+
+
+def _media_reader(
+    read_shape: Callable[[BinaryIO], Shape],
+) -> Callable[[PathType], Dict[str, Shape]]:
+    def read(path: PathType) -> Dict[str, Shape]:
+        with open(path, "rb") as f:
+            return {"": read_shape(f)}
+
+    return read
+
+
+def _npy_shapes(path: PathType) -> Dict[str, Shape]:
+    return {"": npy_header(path).shape}
+
+
+def _npz_shapes(path: PathType) -> Dict[str, Shape]:
+    return {name: header.shape for name, header in npz_headers(path).items()}
+
+
+def _hdf5_shapes(path: PathType) -> Dict[str, Shape]:
+    import h5py
+
+    shapes = {}
+
+    def visit(name, obj):
+        if isinstance(obj, h5py.Dataset):
+            shapes[name] = list(obj.shape)
+
+    with h5py.File(path, "r") as f:
+        f.visititems(visit)
+    return shapes
+
+
+# file extension -> function returning the shapes of all arrays in a file
+READERS: Dict[str, Callable[[PathType], Dict[str, Shape]]] = {
+    ".npy": _npy_shapes,
+    ".npz": _npz_shapes,
+    ".parquet": arrow.parquet_shapes,
+    ".h5": _hdf5_shapes,
+    ".hdf5": _hdf5_shapes,
+    ".png": _media_reader(png_shape),
+    ".jpg": _media_reader(jpeg_shape),
+    ".jpeg": _media_reader(jpeg_shape),
+    ".gif": _media_reader(gif_shape),
+    ".wav": _media_reader(wav_shape),
+}
+
+
+def array_shapes(path: PathType) -> Dict[str, Shape]:
+    """Return the shapes of all arrays (or columns) in a file by name.
+
+    Files that hold a single array use "" as name.
+
+    Raises:
+      ValueError: if the file type is unknown.
+    """
+    extension = os.path.splitext(os.fspath(path))[1].lower()
+    if extension not in READERS:
+        raise ValueError("Cannot read the shape of {}: unknown file type.".format(path))
+    return READERS[extension](path)
+
+
+def file_shape(path: PathType) -> Shape:
+    """Return the shape of the array stored in a file (see READERS).
+
+    Raises:
+      ValueError: if the file type is unknown or the file holds several
+        arrays (use array_shapes for those).
+    """
+    shapes = array_shapes(path)
+    if len(shapes) != 1:
+        raise ValueError(
+            "{} contains {} arrays ({}), use array_shapes to pick one.".format(
+                path, len(shapes), ", ".join(sorted(shapes))
+            )
+        )
+    return next(iter(shapes.values()))
@@ -0,0 +1,191 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pads tensors to a few bucketed shapes described by templates."""
+
+import bisect
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import tensorflow as tf
+
+from shapeguard import backend
+from shapeguard import dim_specs
+from shapeguard import exception
+from shapeguard import parser
+from shapeguard import shape_spec
+from shapeguard import tools
+
+Buckets = Dict[str, Sequence[int]]
+
+
+def bucket_size(name: str, value: int, buckets: Sequence[int]) -> int:
+    """Return the smallest bucket that can hold value."""
+    sorted_buckets = sorted(buckets)
+    idx = bisect.bisect_left(sorted_buckets, value)
+    if idx == len(sorted_buckets):
+        raise exception.ShapeError(
+            "{} = {} exceeds the largest bucket {}".format(
+                name, value, sorted_buckets[-1]
+            )
+        )
+    return sorted_buckets[idx]
+
+
+def padded_dims(
+    dims: Dict[str, int],
+    buckets: Optional[Buckets] = None,
+    multiple_of: Optional[Dict[str, int]] = None,
+) -> Dict[str, int]:
+    """Round dims up to their bucket and/or to a multiple of the given value."""
+    padded = dict(dims)
+    for name, name_buckets in (buckets or {}).items():
+        if name in padded:
+            padded[name] = bucket_size(name, padded[name], name_buckets)
+    for name, multiple in (multiple_of or {}).items():
+        if name in padded:
+            padded[name] = -(-padded[name] // multiple) * multiple
+    return padded
+
+
+def pad_spec(
+    tensor,
+    spec: shape_spec.ShapeSpec,
+    dims: Dict[str, int],
+    buckets: Optional[Buckets] = None,
+    multiple_of: Optional[Dict[str, int]] = None,
+    value=0,
+):
+    """Pad a tensor that matches spec under dims (see pad_to_bucket)."""
+    shape = tools.get_shape(tensor)
+    target_dims = padded_dims(dims, buckets, multiple_of)
+    target = list(shape)
+    for axis, s, e in spec.axis_iter(shape):
+        try:
+            size = e.evaluate(target_dims)
+        except exception.UnderspecifiedShapeError:
+            continue  # e.g. private dims: keep the size of the tensor
+        if isinstance(size, int) and size >= 0:
+            target[axis] = size
+    mask = backend.padding_mask(tensor, shape, target)
+    if target != shape:
+        tensor = backend.pad(tensor, target, value)
+    return tensor, mask
+
+
+def pad_to_bucket(
+    tensor,
+    template: str,
+    dims: Dict[str, int],
+    buckets: Optional[Buckets] = None,
+    multiple_of: Optional[Dict[str, int]] = None,
+    value=0,
+):
+    """Guard tensor against template and pad it to a bucketed shape.
+
+    Args:
+      tensor: numpy array or TF tensor.
+      template: str. Shape template of the tensor (e.g. "B, T, D").
+      dims: Dict[str, int]. Known dims.
+      buckets: Dict[str, List[int]]. Dims that are rounded up to the smallest
+        bucket that holds them (e.g. {"T": [64, 128, 256]}).
+      multiple_of: Dict[str, int]. Dims that are rounded up to a multiple of
+        the given value (e.g. {"D": 8}).
+      value: the padding value.
+
+    Returns:
+      Tuple of the padded tensor and a boolean mask of its valid entries.
+      The mask broadcasts against the padded tensor (axes that were not
+      padded have size 1).
+
+    Raises:
+      ShapeError: if the tensor does not match the template or a dim is
+        larger than its largest bucket.
+    """
+    spec = parser.parse(template)
+    known_dims = tools.guard_spec(tensor, spec, dims, template)
+    return pad_spec(tensor, spec, known_dims, buckets, multiple_of, value)
+
+
+def bucket_by_template(
+    template,
+    buckets: Buckets,
+    batch_size: Union[int, Sequence[int]],
+    dims: Optional[Dict[str, int]] = None,
+    multiple_of: Optional[Dict[str, int]] = None,
+    padding_values=None,
+) -> Callable[[tf.data.Dataset], tf.data.Dataset]:
+    """tf.data transformation that batches elements by bucket and pads them.
+
+    Built on bucket_by_sequence_length with the bucketed dim as length. Use
+    it with dataset.apply(...). Elements longer than the largest bucket are
+    an error.
+
+    Args:
+      template: template of a single (unbatched) element, or a structure of
+        templates matching the structure of the elements.
+      buckets: Dict[str, List[int]]. Exactly one dim and its buckets.
+      batch_size: int or one batch size per bucket.
+      dims: Dict[str, int]. Known dims that are static in the padded shapes.
+      multiple_of: Dict[str, int]. Known dims that are padded to a multiple.
+      padding_values: passed on to bucket_by_sequence_length.
+    """
+    if len(buckets) != 1:
+        raise ValueError("Exactly one bucketed dim is supported by tf.data.")
+    ((name, name_buckets),) = buckets.items()
+    name_buckets = sorted(name_buckets)
+    specs = tf.nest.map_structure(parser.parse, template)
+    flat_specs = tf.nest.flatten(specs)
+    component, axis = _find_axis(flat_specs, name)
+    if isinstance(batch_size, int):
+        batch_sizes = [batch_size] * len(name_buckets)
+    else:
+        batch_sizes = list(batch_size)
+    if len(batch_sizes) != len(name_buckets):
+        raise ValueError("Need one batch size per bucket.")
+
+    static_dims = padded_dims(
+        {n: v for n, v in (dims or {}).items() if n != name}, multiple_of=multiple_of
+    )
+    padded_shapes = tf.nest.map_structure(
+        lambda s: tf.TensorShape(s.static_shape(static_dims)), specs
+    )
+
+    def element_length(*element):
+        flat = tf.nest.flatten(element)
+        return tf.shape(flat[component])[axis]
+
+    def transform(dataset: tf.data.Dataset) -> tf.data.Dataset:
+        # lengths in [boundaries[i-1], boundaries[i]) are padded to boundaries[i]-1
+        return dataset.bucket_by_sequence_length(
+            element_length,
+            bucket_boundaries=[b + 1 for b in name_buckets],
+            bucket_batch_sizes=batch_sizes + batch_sizes[-1:],
+            padded_shapes=padded_shapes,
+            padding_values=padding_values,
+            pad_to_bucket_boundary=True,
+        )
+
+    return transform
+
+
+def _find_axis(specs: List[shape_spec.ShapeSpec], name: str):
+    """Return (component, axis) of the first plain entry with the given name."""
+    for component, spec in enumerate(specs):
+        for axis, e in enumerate(spec.left_entries):
+            if isinstance(e.base(), dim_specs.NamedDim) and e.base().name == name:
+                return component, axis
+        for i, e in enumerate(spec.right_entries):
+            if isinstance(e.base(), dim_specs.NamedDim) and e.base().name == name:
+                return component, i - len(spec.right_entries)
+    raise ValueError('Bucketed dim "{}" is not an entry of the template.'.format(name))
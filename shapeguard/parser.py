@@ -17,6 +17,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from typing import Dict
+
 from shapeguard import dim_specs
 from shapeguard import shape_spec
 from shapeguard import shape_spec_parser
@@ -26,6 +28,7 @@ class TreeToSpec(shape_spec_parser.Transformer):
     start = shape_spec.ShapeSpec
     wildcard = dim_specs.Wildcard.make
     ellipsis = dim_specs.EllipsisDim.make
+    named_ellipsis = dim_specs.NamedEllipsisDim.make
     dynamic = dim_specs.Dynamic.make
     name = dim_specs.NamedDim.make
     dynamic_name = dim_specs.DynamicNamedDim.make
@@ -34,7 +37,43 @@ class TreeToSpec(shape_spec_parser.Transformer):
     sub = dim_specs.SubDims.make
     mul = dim_specs.MulDims.make
     div = dim_specs.DivDims.make
+    lt = dim_specs.LessThan.make
+    le = dim_specs.LessEqual.make
+    gt = dim_specs.GreaterThan.make
+    ge = dim_specs.GreaterEqual.make
+    divisible = dim_specs.Divisible.make
+
+    # functions of a name, e.g. "ragged(T)" or "prod(batch)" (no reserved
+    # words, so that dims can still be named like a function)
+    functions = {"prod": dim_specs.ProdDim, "ragged": dim_specs.RaggedDim}
+
+    def call(self, children):
+        function, name = children
+        if function not in self.functions:
+            raise ValueError(
+                'Unknown function "{}", expected one of {}.'.format(
+                    function, ", ".join(sorted(self.functions))
+                )
+            )
+        return self.functions[function](name)
 
 
 parser = shape_spec_parser.Lark_StandAlone(transformer=TreeToSpec())
-parse = parser.parse
+
+_CACHE_SIZE = 1024
+_cache: Dict[str, shape_spec.ShapeSpec] = {}
+
+
+def parse(template: str) -> shape_spec.ShapeSpec:
+    """Parse a template into a ShapeSpec (cached, since specs are immutable).
+
+    A warm cache also keeps the (untraceable) parser out of torch.compile,
+    which ignores functools.lru_cache. It holds the last _CACHE_SIZE parsed
+    templates, so generated templates cannot grow it without bound.
+    """
+    spec = _cache.get(template)
+    if spec is None:
+        if len(_cache) >= _CACHE_SIZE:
+            del _cache[next(iter(_cache))]  # oldest entry
+        spec = _cache[template] = parser.parse(template)
+    return spec
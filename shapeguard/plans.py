@@ -0,0 +1,270 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compiles template patterns into cached execution plans."""
+
+import functools
+import string
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from shapeguard import backend
+from shapeguard import dim_specs
+from shapeguard import exception
+from shapeguard import parser
+
+# number of plans kept per kind (patterns may be generated, e.g. per rank)
+PLAN_CACHE_SIZE = 1024
+# number of contraction paths kept per einsum plan (one per input shapes)
+PATH_CACHE_SIZE = 64
+
+
+def split_pattern(pattern: str):
+    if pattern.count("->") != 1:
+        raise ValueError('Pattern "{}" needs exactly one "->".'.format(pattern))
+    left, right = pattern.split("->")
+    return left.strip(), right.strip()
+
+
+def entry_names(entry: dim_specs.DimSpec, pattern: str) -> List[str]:
+    """Return the names of the multiplicative components of an entry."""
+    names = []
+    for c in entry.flat_iter():
+        if type(c) is not dim_specs.NamedDim:
+            raise ValueError(
+                'Unsupported entry "{}" in pattern "{}". Only (products of) '
+                "named dims are allowed.".format(entry, pattern)
+            )
+        names.append(c.name)
+    return names
+
+
+class RearrangePlan:
+    """A transpose/reshape/reduce pattern like "B, H, W, C -> B, C, H*W".
+
+    The pattern is executed with at most one reshape to split the input
+    entries into single dims, one reduction over the dims that are missing
+    on the right side, one transpose and one reshape to merge the dims of the
+    output entries. Steps that would be no-ops are skipped.
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.input_template, self.output_template = split_pattern(pattern)
+        self.input_spec = parser.parse(self.input_template)
+        self.output_spec = parser.parse(self.output_template)
+
+        input_names = [entry_names(e, pattern) for e in self.input_spec.entries]
+        self.names = [n for names in input_names for n in names]
+        output_names: List[str] = []
+        merge = False
+        for e in self.output_spec.entries:
+            if isinstance(e, dim_specs.Number):
+                if e.value != 1:
+                    raise ValueError(
+                        'Constant output entry "{}" in pattern "{}". Only new '
+                        "axes of size 1 are supported.".format(e, pattern)
+                    )
+                merge = True  # new axis of size 1
+            else:
+                names = entry_names(e, pattern)
+                output_names.extend(names)
+                merge = merge or len(names) > 1
+        if len(set(self.names)) != len(self.names) or len(set(output_names)) != len(
+            output_names
+        ):
+            raise ValueError('Repeated dim in pattern "{}".'.format(pattern))
+        unknown = set(output_names) - set(self.names)
+        if unknown:
+            raise ValueError(
+                'Output dims {} do not appear in the input of pattern "{}".'.format(
+                    sorted(unknown), pattern
+                )
+            )
+
+        self.split = any(len(names) > 1 for names in input_names)
+        self.reduce_axes = [
+            i for i, n in enumerate(self.names) if n not in output_names
+        ]
+        kept = [n for n in self.names if n in output_names]
+        perm = [kept.index(n) for n in output_names]
+        self.perm: Optional[List[int]] = None if perm == sorted(perm) else perm
+        self.merge = merge
+
+    def apply(self, tensor, dims: Dict[str, int], reduction: Optional[str] = None):
+        """Execute the plan, where dims has to include the private dims."""
+        if self.split:
+            unknown = [n for n in self.names if n not in dims]
+            if unknown:
+                raise exception.UnderspecifiedShapeError(
+                    'Cannot split the input of pattern "{}": unknown dims {}.'.format(
+                        self.pattern, unknown
+                    )
+                )
+            tensor = backend.reshape(tensor, [dims[n] for n in self.names])
+        if self.reduce_axes:
+            if reduction is None:
+                raise ValueError(
+                    'Pattern "{}" drops dims, but no reduction was given.'.format(
+                        self.pattern
+                    )
+                )
+            tensor = backend.reduce(tensor, self.reduce_axes, reduction)
+        if self.perm is not None:
+            tensor = backend.transpose(tensor, self.perm)
+        if self.merge:
+            tensor = backend.reshape(tensor, self.output_spec.evaluate(dims))
+        return tensor
+
+
+class EinsumPlan:
+    """An einsum pattern with named dims like "B, T, D; D, K -> B, T, K".
+
+    The pattern is translated once into an einsum subscript string (here
+    "abc,cd->abd"). For numpy operands the optimized contraction path is
+    cached per combination of input shapes (the last PATH_CACHE_SIZE ones).
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        inputs, self.output_template = split_pattern(pattern)
+        self.input_templates = [t.strip() for t in inputs.split(";")]
+        self.input_specs = [parser.parse(t) for t in self.input_templates]
+        self.output_spec = parser.parse(self.output_template)
+        self.letters: Dict[str, str] = {}
+        input_subscripts = ",".join(self._subscripts(s) for s in self.input_specs)
+        input_letters = set(self.letters.values())
+        output_subscripts = self._subscripts(self.output_spec)
+        if not set(self.letters.values()) <= input_letters:
+            raise ValueError(
+                'Output of pattern "{}" uses dims that are not in any '
+                "input.".format(pattern)
+            )
+        self.subscripts = "{}->{}".format(input_subscripts, output_subscripts)
+        self.paths: Dict[Tuple[Tuple[int, ...], ...], List] = {}
+
+    def _subscripts(self, spec) -> str:
+        subscripts = ""
+        for e in spec.entries:
+            if type(e) is dim_specs.EllipsisDim:
+                subscripts += "..."
+            elif type(e) is dim_specs.NamedDim:
+                if e.name not in self.letters:
+                    if len(self.letters) == len(string.ascii_letters):
+                        raise ValueError(
+                            'Too many dims in pattern "{}".'.format(self.pattern)
+                        )
+                    self.letters[e.name] = string.ascii_letters[len(self.letters)]
+                subscripts += self.letters[e.name]
+            else:
+                raise ValueError(
+                    'Unsupported entry "{}" in pattern "{}". Only named dims and '
+                    '"..." are allowed.'.format(e, self.pattern)
+                )
+        return subscripts
+
+    def inputs(self, operands):
+        """Iterate (operand, spec, template) for all operands."""
+        if len(operands) != len(self.input_specs):
+            raise ValueError(
+                'Pattern "{}" expects {} operands but got {}.'.format(
+                    self.pattern, len(self.input_specs), len(operands)
+                )
+            )
+        return zip(operands, self.input_specs, self.input_templates)
+
+    def apply(self, *operands):
+        if not all(isinstance(op, np.ndarray) for op in operands):
+            return backend.einsum(self.subscripts, *operands)
+        shapes = tuple(op.shape for op in operands)
+        if shapes not in self.paths:
+            if len(self.paths) >= PATH_CACHE_SIZE:
+                del self.paths[next(iter(self.paths))]  # oldest entry
+            self.paths[shapes] = np.einsum_path(
+                self.subscripts, *operands, optimize="greedy"
+            )[0]
+        return np.einsum(self.subscripts, *operands, optimize=self.paths[shapes])
+
+
+class BroadcastPlan:
+    """Inserts the dims needed to go from one template to another.
+
+    The entries of the source template have to appear in the same order in
+    the target template (e.g. "B, D" -> "B, T, D"). Every other entry of the
+    target is inserted as a new dim of size 1 (expand) that can then be
+    broadcast to its actual size.
+    """
+
+    def __init__(self, source: str, target: str):
+        self.source_template = source
+        self.target_template = target
+        self.source_spec = parser.parse(source)
+        self.target_spec = parser.parse(target)
+        source_entries = self.source_spec.entries
+        self.inserted: List[int] = []
+        i = 0
+        for pos, e in enumerate(self.target_spec.entries):
+            if i < len(source_entries) and source_entries[i] == e:
+                i += 1
+            else:
+                self.inserted.append(pos)
+        target_entries = self.target_spec.entries
+        inserts_ellipsis = any(
+            isinstance(target_entries[p], dim_specs.EllipsisDim) for p in self.inserted
+        )
+        if i < len(source_entries) or inserts_ellipsis:
+            raise ValueError(
+                'Cannot broadcast "{}" to "{}": the entries of the source have to '
+                "appear in the same order in the target.".format(source, target)
+            )
+        # positions after an ellipsis are counted from the end
+        self.n_left = len(self.target_spec.left_entries)
+        self.inserted_entries = [target_entries[p] for p in self.inserted]
+        self.from_end = [len(target_entries) - p for p in self.inserted]
+
+    def axes(self, rank: int) -> List[int]:
+        """Return the inserted axes for a source tensor of the given rank."""
+        out_rank = rank + len(self.inserted)
+        return [
+            p if p < self.n_left else out_rank - e
+            for p, e in zip(self.inserted, self.from_end)
+        ]
+
+    def expand(self, tensor, shape: List[int]):
+        expanded = list(shape)
+        for axis in self.axes(len(shape)):
+            expanded.insert(axis, 1)
+        return backend.reshape(tensor, expanded)
+
+    def broadcast(self, tensor, shape: List[int], dims: Dict[str, int]):
+        target = list(shape)
+        for axis, e in zip(self.axes(len(shape)), self.inserted_entries):
+            target.insert(axis, e.evaluate(dims))
+        return backend.broadcast_to(self.expand(tensor, shape), target)
+
+
+@functools.lru_cache(maxsize=PLAN_CACHE_SIZE)
+def rearrange_plan(pattern: str) -> RearrangePlan:
+    return RearrangePlan(pattern)
+
+
+@functools.lru_cache(maxsize=PLAN_CACHE_SIZE)
+def einsum_plan(pattern: str) -> EinsumPlan:
+    return EinsumPlan(pattern)
+
+
+@functools.lru_cache(maxsize=PLAN_CACHE_SIZE)
+def broadcast_plan(source: str, target: str) -> BroadcastPlan:
+    return BroadcastPlan(source, target)
@@ -0,0 +1,250 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Checks per-row constraints of ragged data with vector operations."""
+
+import functools
+import operator
+import re
+from collections import ChainMap
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import tensorflow as tf
+
+from shapeguard import dim_specs
+from shapeguard import exception
+from shapeguard import parser
+from shapeguard import tools
+
+COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<=": operator.le,
+    ">=": operator.ge,
+    "<": operator.lt,
+    ">": operator.gt,
+}
+
+_COMPARISON_RE = re.compile(r"(==|!=|<=|>=|<|>)")
+
+RowConstraint = Tuple[dim_specs.DimSpec, str, dim_specs.DimSpec]
+
+
+@functools.lru_cache(maxsize=None)
+def parse_constraint(constraint: str) -> RowConstraint:
+    """Parse a constraint like "T <= 512" or "T_audio == 4*T_text"."""
+    parts = _COMPARISON_RE.split(constraint)
+    if len(parts) != 3:
+        raise ValueError(
+            'Row constraint "{}" needs exactly one of {}.'.format(
+                constraint, ", ".join(COMPARISONS)
+            )
+        )
+    left, op, right = parts
+    return _parse_dim(left, constraint), op, _parse_dim(right, constraint)
+
+
+def _parse_dim(text: str, constraint: str) -> dim_specs.DimSpec:
+    spec = parser.parse(text.strip())
+    if len(spec.entries) != 1 or isinstance(
+        spec.entries[0], (dim_specs.EllipsisDim, dim_specs.Wildcard)
+    ):
+        raise ValueError(
+            'Both sides of row constraint "{}" must be a single dim.'.format(constraint)
+        )
+    dim = spec.entries[0]
+    if isinstance(dim, dim_specs.DynamicNamedDim):
+        dim = dim_specs.NamedDim(dim.name)  # row lengths are never optional
+    return dim
+
+
+def row_lengths(
+    tensor, template: str, dims: Optional[Dict[str, int]] = None
+) -> Dict[str, Any]:
+    """Return the lengths of each row for the ragged dim of tensor.
+
+    The ragged dim has to be the second entry of the template (e.g.
+    "B, ragged(T)" or "B, ragged(T), D"). For a tf.RaggedTensor the lengths
+    are computed from its row_splits, for a dense tensor every row has the
+    uniform size.
+
+    Returns:
+      Dict[str, Vector]: {ragged dim name: vector of row lengths}.
+
+    Raises:
+      ShapeError: if tensor does not match the template.
+      ValueError: if the template has no ragged dim or a ragged dim at an
+        axis other than the second.
+    """
+    spec = parser.parse(template)
+    tools.guard_spec(tensor, spec, dims or {}, template)
+    ragged = [
+        (axis, e.base())
+        for axis, e in enumerate(spec.left_entries)
+        if isinstance(e.base(), dim_specs.RaggedDim)
+    ]
+    if len(ragged) != 1 or ragged[0][0] != 1:
+        raise ValueError(
+            'Template "{}" needs a single ragged dim as second entry.'.format(template)
+        )
+    _, dim = ragged[0]
+    if isinstance(tensor, tf.RaggedTensor):
+        return {dim.name: tensor.row_lengths()}
+    shape = tools.get_shape(tensor)
+    if None in shape[:2]:  # a dense tensor in graph mode
+        sizes = tf.shape(tensor, out_type=tf.int64)
+        return {dim.name: tf.fill(sizes[:1], sizes[1])}
+    return {dim.name: np.full(shape[0], shape[1], dtype=np.int64)}
+
+
+class RowCheckResult:
+    """Outcome of check_rows.
+
+    Attributes:
+      ok: bool. True if all rows satisfy all constraints.
+      rows: np.ndarray. Sorted indices of the rows that violate a constraint.
+      failures: Dict[str, np.ndarray]. Offending rows of each failed
+        constraint.
+
+    In graph mode (tf.function, tf.data) ok is a scalar bool tensor, rows
+    and failures hold int64 tensors (for every constraint), and the result
+    cannot be used as a bool.
+    """
+
+    def __init__(self, rows, failures: Dict[str, Any], ok=None):
+        self.ok = not failures if ok is None else ok
+        self.rows = rows
+        self.failures = failures
+
+    @property
+    def message(self) -> str:
+        if isinstance(self.ok, tf.Tensor):
+            return "Row constraints {}".format(", ".join(self.failures))
+        if self.ok:
+            return ""
+        lines = ["Row constraints violated"]
+        for constraint, rows in self.failures.items():
+            shown = ", ".join(str(r) for r in rows[:10])
+            more = ", ..." if len(rows) > 10 else ""
+            lines.append(
+                '  "{}" in {} rows: [{}{}]'.format(constraint, len(rows), shown, more)
+            )
+        return "\n".join(lines)
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def __repr__(self) -> str:
+        return "<RowCheckResult ok={} rows={}>".format(self.ok, list(self.rows))
+
+
+def check_rows(
+    constraints: Union[str, Sequence[str]],
+    row_dims: Mapping[str, Any],
+    dims: Optional[Mapping[str, int]] = None,
+) -> RowCheckResult:
+    """Check constraints for every row without looping over the rows.
+
+    Each constraint is evaluated with the usual dim arithmetic, where the
+    names in row_dims are bound to whole vectors (one entry per row), so it
+    costs a single vectorized comparison in NumPy or TF. Inside tf.function
+    or tf.data the result holds tensors (see RowCheckResult).
+
+    Args:
+      constraints: str or list of str, e.g. "T <= 512" or "T_x == T_y + 1".
+      row_dims: Dict[str, Vector]. Per-row values, e.g. from row_lengths.
+      dims: Dict[str, int]. Known scalar dims.
+
+    Returns:
+      RowCheckResult with the indices of the offending rows.
+    """
+    if isinstance(constraints, str):
+        constraints = [constraints]
+    vectors = _as_vectors(row_dims)
+    known_dims = ChainMap(vectors, dims or {})
+    use_tf = any(isinstance(v, tf.Tensor) for v in vectors.values())
+    num_rows = _num_rows(vectors)
+    violations: List[Tuple[str, Any]] = []
+    for constraint in constraints:
+        left, op, right = parse_constraint(constraint)
+        satisfied = COMPARISONS[op](
+            left.evaluate(known_dims), right.evaluate(known_dims)
+        )
+        if use_tf:
+            bad = tf.logical_not(tf.broadcast_to(satisfied, [num_rows]))
+        else:
+            bad = ~np.broadcast_to(satisfied, (num_rows,))
+        violations.append((constraint, bad))
+    if use_tf and not tf.executing_eagerly():
+        any_bad = functools.reduce(tf.logical_or, (bad for _, bad in violations))
+        return RowCheckResult(
+            tf.where(any_bad)[:, 0],
+            {c: tf.where(bad)[:, 0] for c, bad in violations},
+            tf.logical_not(tf.reduce_any(any_bad)),
+        )
+    if use_tf:
+        violations = [(c, bad.numpy()) for c, bad in violations]
+    failures = {c: np.flatnonzero(bad) for c, bad in violations if bad.any()}
+    if not failures:
+        return RowCheckResult(np.zeros(0, dtype=np.int64), {})
+    any_bad = functools.reduce(np.logical_or, (bad for _, bad in violations))
+    return RowCheckResult(np.flatnonzero(any_bad), failures)
+
+
+def guard_rows(
+    constraints: Union[str, Sequence[str]],
+    row_dims: Mapping[str, Any],
+    dims: Optional[Mapping[str, int]] = None,
+) -> None:
+    """Like check_rows, but raises a RowConstraintError with the offending rows.
+
+    In graph mode a tf.debugging.Assert is added instead, which raises an
+    InvalidArgumentError with the offending rows of each constraint.
+    """
+    result = check_rows(constraints, row_dims, dims)
+    if isinstance(result.ok, tf.Tensor):
+        data: List[Any] = ["Row constraints violated"]
+        for constraint, rows in result.failures.items():
+            data += ['"{}" in rows'.format(constraint), rows]
+        tf.debugging.Assert(result.ok, data, summarize=10)
+        return
+    if not result:
+        raise exception.RowConstraintError(result.message, result.rows)
+
+
+def _as_vectors(row_dims: Mapping[str, Any]) -> Dict[str, Any]:
+    vectors = {}
+    use_tf = any(isinstance(v, tf.Tensor) for v in row_dims.values())
+    for name, value in row_dims.items():
+        if use_tf:
+            # row_lengths are int64 while lengths built by hand are often int32
+            vectors[name] = tf.cast(value, tf.int64)
+        else:
+            vectors[name] = np.asarray(value)
+    return vectors
+
+
+def _num_rows(vectors: Dict[str, Any]) -> int:
+    if not vectors:
+        raise ValueError("Need at least one row dim.")
+    counts = {name: v.shape[0] for name, v in vectors.items()}
+    known = {int(c) for c in counts.values() if c is not None}
+    if len(known) > 1:
+        raise exception.ShapeError(
+            "Row dims have different numbers of rows: {}".format(counts)
+        )
+    if known:
+        return known.pop()
+    return tf.shape(next(iter(vectors.values())))[0]  # unknown in graph mode
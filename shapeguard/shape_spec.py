@@ -30,25 +30,44 @@ class ShapeSpec:
         self.entries = [
             x for x in entries if not isinstance(x, shape_spec_parser.Token)
         ]
-        if dim_specs.ellipsis_dim in self.entries:
-            idx = self.entries.index(dim_specs.ellipsis_dim)
+        ellipses = [
+            i
+            for i, x in enumerate(self.entries)
+            if isinstance(x, dim_specs.EllipsisDim)
+        ]
+        if ellipses:
+            idx = ellipses[0]
             self.left_entries = self.entries[:idx]
             self.right_entries = self.entries[idx + 1 :]
             self.has_ellipsis = True
+            self.ellipsis = self.entries[idx]
         else:
             self.left_entries = self.entries
             self.right_entries = []
             self.has_ellipsis = False
+            self.ellipsis = None
+        # named ellipsis (e.g. "*batch") that binds the dims it matches
+        self.named_ellipsis = (
+            self.ellipsis
+            if isinstance(self.ellipsis, dim_specs.NamedEllipsisDim)
+            else None
+        )
 
     def evaluate(self, known_dims: Dict[str, int] = None) -> List[Optional[int]]:
         known_dims = known_dims or {}
 
-        if self.has_ellipsis:
+        if self.has_ellipsis and self.named_ellipsis is None:
             raise exception.UnderspecifiedShapeError(
                 "Template with an ellipsis (...) cannot be fully evaluated."
             )
         else:
-            return [x.evaluate(known_dims) for x in self.entries]
+            shape: List[Optional[int]] = []
+            for x in self.entries:
+                if x is self.named_ellipsis:
+                    shape.extend(x.evaluate(known_dims))
+                else:
+                    shape.append(x.evaluate(known_dims))
+            return shape
 
     def partial_evaluate(
         self, known_dims: Dict[str, int] = None
@@ -57,11 +76,40 @@ class ShapeSpec:
         eval_shape: List[Union[int, str, None]] = []
         for x in self.entries:
             try:
-                eval_shape.append(x.evaluate(known_dims))
+                if x is self.named_ellipsis:
+                    eval_shape.extend(x.evaluate(known_dims))
+                else:
+                    eval_shape.append(x.evaluate(known_dims))
             except exception.UnderspecifiedShapeError:
                 eval_shape.append(repr(x))
         return eval_shape
 
+    def static_shape(
+        self, known_dims: Dict[str, int] = None
+    ) -> Optional[List[Optional[int]]]:
+        """Evaluate as a static shape with None for every varying dimension.
+
+        Dynamic ("?") dims, wildcards and unknown dims become None, even if a
+        value for the dynamic dim is known. Returns None (unknown rank) if the
+        template contains an unnamed or unknown ellipsis.
+        """
+        known_dims = known_dims or {}
+        shape: List[Optional[int]] = []
+        for x in self.entries:
+            if isinstance(x.base(), (dim_specs.DynamicNamedDim, dim_specs.Wildcard)):
+                shape.append(None)
+                continue
+            try:
+                if isinstance(x, dim_specs.EllipsisDim):
+                    shape.extend(x.evaluate(known_dims))
+                else:
+                    shape.append(x.evaluate(known_dims))
+            except exception.UnderspecifiedShapeError:
+                if isinstance(x, dim_specs.EllipsisDim):
+                    return None
+                shape.append(None)
+        return shape
+
     def rank_matches(self, shape: ShapeType) -> bool:
         if self.has_ellipsis:
             if len(shape) < len(self.entries) - 1:
@@ -72,20 +120,46 @@ class ShapeSpec:
         return True
 
     def matches(self, shape, known_dims: Dict[str, int] = None) -> bool:
-        known_dims = known_dims or {}
-        rank_matches = self.rank_matches(shape)
-        conflicts = any(
-            [x.has_conflict(s, known_dims) for s, x in self.zip_iter(shape)]
+        return (
+            self.rank_matches(shape) and self.first_conflict(shape, known_dims) is None
         )
 
-        return rank_matches and not conflicts
+    def first_conflict(
+        self, shape: ShapeType, known_dims: Dict[str, int] = None
+    ) -> Optional[int]:
+        """Return the axis of the first shape entry that conflicts (or None)."""
+        known_dims = known_dims or {}
+        for i, s, x in self.axis_iter(shape):
+            if x.has_conflict(s, known_dims):
+                return i
+        if self.named_ellipsis is not None and self.named_ellipsis.name in known_dims:
+            start = len(self.left_entries)
+            matched = self.ellipsis_shape(shape)
+            expected = self.named_ellipsis.evaluate(known_dims)
+            for i, (s, e) in enumerate(zip(matched, expected)):
+                if s != e:
+                    return start + i
+            if len(matched) != len(expected):
+                return start + min(len(matched), len(expected))
+        return None
+
+    def ellipsis_shape(self, shape: ShapeType) -> Tuple[int, ...]:
+        """Return the part of the shape that is matched by the ellipsis."""
+        return tuple(
+            shape[len(self.left_entries) : len(shape) - len(self.right_entries)]
+        )
 
     def zip_iter(self, shape: ShapeType):
-        for s, e in zip(shape, self.left_entries):
+        for _, s, e in self.axis_iter(shape):
             yield s, e
+
+    def axis_iter(self, shape: ShapeType):
+        for i, (s, e) in enumerate(zip(shape, self.left_entries)):
+            yield i, s, e
         if self.right_entries:
-            for s, e in zip(shape[-len(self.right_entries) :], self.right_entries):
-                yield s, e
+            offset = max(len(shape) - len(self.right_entries), 0)
+            for i, (s, e) in enumerate(zip(shape[offset:], self.right_entries)):
+                yield offset + i, s, e
 
     def infer(
         self, shape: ShapeType, known_dims: Dict[str, int] = None
@@ -99,6 +173,13 @@ class ShapeSpec:
             for s, x in self.zip_iter(shape):
                 inferred.update(x.infer(s, current_known))
             current_known.update(inferred)
+        if self.named_ellipsis is not None:
+            name = self.named_ellipsis.name
+            matched = self.ellipsis_shape(shape)
+            if name not in current_known and None not in matched:
+                current_known[name] = matched
+                # now expressions like prod(batch) might allow further inference
+                return self.infer(shape, current_known)
         return current_known
 
     def __repr__(self) -> str:
@@ -1866,10 +1866,10 @@ class Lark(Serialize):
 
 
 DATA = (
-{'parser': {'parser': {'tokens': {0: 'INT', 1: 'dim', 2: 'ellipsis', 3: 'CNAME', 4: 'product', 5: '__ANON_0', 6: 'sum', 7: 'start', 8: 'LPAR', 9: 'QMARK', 10: 'item', 11: 'STAR', 12: 'dynamic', 13: 'wildcard', 14: 'COMMA', 15: 'SLASH', 16: 'RPAR', 17: '$END', 18: 'MINUS', 19: 'PLUS', 20: '__anon_star_0'}, 'states': {0: {0: (0, 1), 1: (0, 2), 2: (0, 3), 3: (0, 4), 4: (0, 5), 5: (0, 6), 6: (0, 7), 7: (0, 8), 8: (0, 9), 9: (0, 10), 10: (0, 11), 11: (0, 12), 12: (0, 13), 13: (0, 14)}, 1: {14: (1, {'@': 12}), 15: (1, {'@': 12}), 16: (1, {'@': 12}), 11: (1, {'@': 12}), 17: (1, {'@': 12}), 18: (1, {'@': 12}), 19: (1, {'@': 12})}, 2: {17: (1, {'@': 13}), 20: (0, 15), 14: (0, 16)}, 3: {14: (1, {'@': 14}), 17: (1, {'@': 14})}, 4: {14: (1, {'@': 15}), 15: (1, {'@': 15}), 16: (1, {'@': 15}), 11: (1, {'@': 15}), 17: (1, {'@': 15}), 18: (1, {'@': 15}), 19: (1, {'@': 15}), 9: (0, 17)}, 5: {16: (1, {'@': 16}), 19: (1, {'@': 16}), 17: (1, {'@': 16}), 18: (1, {'@': 16}), 14: (1, {'@': 16}), 11: (0, 18), 15: (0, 19)}, 6: {14: (1, {'@': 17}), 17: (1, {'@': 17})}, 7: {14: (1, {'@': 18}), 17: (1, {'@': 18}), 18: (0, 20), 19: (0, 21)}, 8: {17: (0, 22)}, 9: {0: (0, 1), 4: (0, 5), 3: (0, 4), 8: (0, 9), 6: (0, 23), 10: (0, 11)}, 10: {14: (1, {'@': 19}), 17: (1, {'@': 19})}, 11: {14: (1, {'@': 20}), 15: (1, {'@': 20}), 16: (1, {'@': 20}), 11: (1, {'@': 20}), 17: (1, {'@': 20}), 18: (1, {'@': 20}), 19: (1, {'@': 20})}, 12: {14: (1, {'@': 21}), 17: (1, {'@': 21})}, 13: {14: (1, {'@': 22}), 17: (1, {'@': 22})}, 14: {14: (1, {'@': 23}), 17: (1, {'@': 23})}, 15: {17: (1, {'@': 24}), 14: (0, 24)}, 16: {0: (0, 1), 2: (0, 3), 3: (0, 4), 4: (0, 5), 5: (0, 6), 6: (0, 7), 1: (0, 25), 8: (0, 9), 9: (0, 10), 10: (0, 11), 11: (0, 12), 12: (0, 13), 13: (0, 14)}, 17: {14: (1, {'@': 25}), 15: (1, {'@': 25}), 16: (1, {'@': 25}), 11: (1, {'@': 25}), 17: (1, {'@': 25}), 18: (1, {'@': 25}), 19: (1, {'@': 25})}, 18: {0: (0, 1), 10: (0, 26), 8: (0, 9), 3: (0, 4)}, 19: {10: (0, 27), 0: (0, 1), 8: (0, 9), 3: (0, 4)}, 20: {0: (0, 1), 3: (0, 4), 8: (0, 9), 4: (0, 28), 10: (0, 11)}, 21: {0: (0, 1), 3: (0, 4), 8: (0, 9), 4: (0, 29), 10: (0, 11)}, 22: {}, 23: {18: (0, 20), 19: (0, 21), 16: (0, 30)}, 24: {0: (0, 1), 2: (0, 3), 3: (0, 4), 4: (0, 5), 5: (0, 6), 6: (0, 7), 1: (0, 31), 8: (0, 9), 9: (0, 10), 10: (0, 11), 11: (0, 12), 12: (0, 13), 13: (0, 14)}, 25: {14: (1, {'@': 26}), 17: (1, {'@': 26})}, 26: {14: (1, {'@': 27}), 15: (1, {'@': 27}), 16: (1, {'@': 27}), 11: (1, {'@': 27}), 17: (1, {'@': 27}), 18: (1, {'@': 27}), 19: (1, {'@': 27})}, 27: {14: (1, {'@': 28}), 15: (1, {'@': 28}), 16: (1, {'@': 28}), 11: (1, {'@': 28}), 17: (1, {'@': 28}), 18: (1, {'@': 28}), 19: (1, {'@': 28})}, 28: {16: (1, {'@': 29}), 19: (1, {'@': 29}), 17: (1, {'@': 29}), 18: (1, {'@': 29}), 14: (1, {'@': 29}), 11: (0, 18), 15: (0, 19)}, 29: {16: (1, {'@': 30}), 19: (1, {'@': 30}), 17: (1, {'@': 30}), 18: (1, {'@': 30}), 14: (1, {'@': 30}), 11: (0, 18), 15: (0, 19)}, 30: {14: (1, {'@': 31}), 15: (1, {'@': 31}), 16: (1, {'@': 31}), 11: (1, {'@': 31}), 17: (1, {'@': 31}), 18: (1, {'@': 31}), 19: (1, {'@': 31})}, 31: {14: (1, {'@': 32}), 17: (1, {'@': 32})}}, 'start_state': 0, 'end_state': 22}, 'lexer_conf': {'tokens': [{'@': 0}, {'@': 1}, {'@': 2}, {'@': 3}, {'@': 4}, {'@': 5}, {'@': 6}, {'@': 7}, {'@': 8}, {'@': 9}, {'@': 10}, {'@': 11}], 'ignore': ['WS'], '__type__': 'LexerConf'}, '__type__': 'LALR_ContextualLexer'}, 'rules': [{'@': 24}, {'@': 13}, {'@': 18}, {'@': 23}, {'@': 14}, {'@': 22}, {'@': 16}, {'@': 30}, {'@': 29}, {'@': 20}, {'@': 27}, {'@': 28}, {'@': 12}, {'@': 15}, {'@': 25}, {'@': 31}, {'@': 21}, {'@': 17}, {'@': 19}, {'@': 26}, {'@': 32}], 'options': {'debug': False, 'keep_all_tokens': False, 'tree_class': None, 'cache_grammar': False, 'postlex': None, 'parser': 'lalr', 'lexer': 'contextual', 'transformer': None, 'start': 'start', 'profile': False, 'priority': None, 'ambiguity': 'auto', 'propagate_positions': False, 'lexer_callbacks': {}, 'maybe_placeholders': False}, '__type__': 'Lark'}
+{'parser': {'parser': {'tokens': {0: 'product', 1: 'start', 2: 'sum', 3: 'dim', 4: 'bounded', 5: 'LPAR', 6: 'named_ellipsis', 7: 'CNAME', 8: 'QMARK', 9: 'STAR', 10: 'INT', 11: 'ellipsis', 12: '__ANON_3', 13: 'wildcard', 14: 'item', 15: 'dynamic', 16: 'MINUS', 17: 'MORETHAN', 18: '__ANON_0', 19: 'LESSTHAN', 20: '$END', 21: 'PERCENT', 22: 'COMMA', 23: '__ANON_1', 24: 'PLUS', 25: 'RPAR', 26: 'SLASH', 27: '__anon_star_0', 28: '__ANON_2'}, 'states': {0: {0: (0, 1), 1: (0, 2), 2: (0, 3), 3: (0, 4), 4: (0, 5), 5: (0, 6), 6: (0, 7), 7: (0, 8), 8: (0, 9), 9: (0, 10), 10: (0, 11), 11: (0, 12), 12: (0, 13), 13: (0, 14), 14: (0, 15), 15: (0, 16)}, 1: {16: (1, {'@': 18}), 17: (1, {'@': 18}), 18: (1, {'@': 18}), 19: (1, {'@': 18}), 20: (1, {'@': 18}), 21: (1, {'@': 18}), 22: (1, {'@': 18}), 23: (1, {'@': 18}), 24: (1, {'@': 18}), 25: (1, {'@': 18}), 26: (0, 17), 9: (0, 18)}, 2: {20: (0, 19)}, 3: {17: (1, {'@': 19}), 18: (1, {'@': 19}), 19: (1, {'@': 19}), 20: (1, {'@': 19}), 21: (1, {'@': 19}), 22: (1, {'@': 19}), 23: (1, {'@': 19}), 24: (0, 20), 16: (0, 21)}, 4: {20: (1, {'@': 20}), 22: (0, 22), 27: (0, 23)}, 5: {20: (1, {'@': 21}), 22: (1, {'@': 21}), 21: (0, 24), 18: (0, 25), 19: (0, 26), 23: (0, 27), 17: (0, 28)}, 6: {0: (0, 1), 7: (0, 8), 2: (0, 29), 5: (0, 6), 10: (0, 11), 14: (0, 15)}, 7: {20: (1, {'@': 22}), 22: (1, {'@': 22})}, 8: {26: (1, {'@': 23}), 18: (1, {'@': 23}), 20: (1, {'@': 23}), 21: (1, {'@': 23}), 22: (1, {'@': 23}), 24: (1, {'@': 23}), 25: (1, {'@': 23}), 16: (1, {'@': 23}), 17: (1, {'@': 23}), 9: (1, {'@': 23}), 28: (1, {'@': 23}), 19: (1, {'@': 23}), 23: (1, {'@': 23}), 5: (0, 30), 8: (0, 31)}, 9: {20: (1, {'@': 24}), 22: (1, {'@': 24})}, 10: {20: (1, {'@': 25}), 22: (1, {'@': 25}), 7: (0, 32)}, 11: {26: (1, {'@': 26}), 18: (1, {'@': 26}), 20: (1, {'@': 26}), 21: (1, {'@': 26}), 22: (1, {'@': 26}), 24: (1, {'@': 26}), 25: (1, {'@': 26}), 16: (1, {'@': 26}), 17: (1, {'@': 26}), 9: (1, {'@': 26}), 28: (1, {'@': 26}), 19: (1, {'@': 26}), 23: (1, {'@': 26})}, 12: {20: (1, {'@': 27}), 22: (1, {'@': 27})}, 13: {20: (1, {'@': 28}), 22: (1, {'@': 28})}, 14: {20: (1, {'@': 29}), 22: (1, {'@': 29})}, 15: {26: (1, {'@': 30}), 18: (1, {'@': 30}), 20: (1, {'@': 30}), 21: (1, {'@': 30}), 22: (1, {'@': 30}), 24: (1, {'@': 30}), 25: (1, {'@': 30}), 16: (1, {'@': 30}), 17: (1, {'@': 30}), 9: (1, {'@': 30}), 19: (1, {'@': 30}), 23: (1, {'@': 30})}, 16: {20: (1, {'@': 31}), 22: (1, {'@': 31})}, 17: {14: (0, 33), 5: (0, 6), 7: (0, 8), 10: (0, 11)}, 18: {14: (0, 34), 5: (0, 6), 7: (0, 8), 10: (0, 11)}, 19: {}, 20: {5: (0, 6), 10: (0, 11), 7: (0, 8), 0: (0, 35), 14: (0, 15)}, 21: {5: (0, 6), 10: (0, 11), 0: (0, 36), 7: (0, 8), 14: (0, 15)}, 22: {0: (0, 1), 2: (0, 3), 4: (0, 5), 5: (0, 6), 6: (0, 7), 7: (0, 8), 8: (0, 9), 3: (0, 37), 9: (0, 10), 10: (0, 11), 11: (0, 12), 12: (0, 13), 13: (0, 14), 14: (0, 15), 15: (0, 16)}, 23: {20: (1, {'@': 32}), 22: (0, 38)}, 24: {5: (0, 6), 7: (0, 8), 10: (0, 11), 14: (0, 39)}, 25: {0: (0, 1), 2: (0, 40), 5: (0, 6), 10: (0, 11), 7: (0, 8), 14: (0, 15)}, 26: {0: (0, 1), 2: (0, 41), 5: (0, 6), 10: (0, 11), 7: (0, 8), 14: (0, 15)}, 27: {0: (0, 1), 2: (0, 42), 5: (0, 6), 10: (0, 11), 7: (0, 8), 14: (0, 15)}, 28: {0: (0, 1), 7: (0, 8), 2: (0, 43), 5: (0, 6), 10: (0, 11), 14: (0, 15)}, 29: {25: (0, 44), 24: (0, 20), 16: (0, 21)}, 30: {7: (0, 45)}, 31: {26: (1, {'@': 33}), 18: (1, {'@': 33}), 20: (1, {'@': 33}), 21: (1, {'@': 33}), 22: (1, {'@': 33}), 24: (1, {'@': 33}), 25: (1, {'@': 33}), 16: (1, {'@': 33}), 17: (1, {'@': 33}), 9: (1, {'@': 33}), 28: (1, {'@': 33}), 19: (1, {'@': 33}), 23: (1, {'@': 33})}, 32: {20: (1, {'@': 34}), 22: (1, {'@': 34})}, 33: {26: (1, {'@': 35}), 18: (1, {'@': 35}), 20: (1, {'@': 35}), 21: (1, {'@': 35}), 22: (1, {'@': 35}), 24: (1, {'@': 35}), 25: (1, {'@': 35}), 16: (1, {'@': 35}), 17: (1, {'@': 35}), 9: (1, {'@': 35}), 19: (1, {'@': 35}), 23: (1, {'@': 35})}, 34: {26: (1, {'@': 36}), 18: (1, {'@': 36}), 20: (1, {'@': 36}), 21: (1, {'@': 36}), 22: (1, {'@': 36}), 24: (1, {'@': 36}), 25: (1, {'@': 36}), 16: (1, {'@': 36}), 17: (1, {'@': 36}), 9: (1, {'@': 36}), 19: (1, {'@': 36}), 23: (1, {'@': 36})}, 35: {16: (1, {'@': 37}), 17: (1, {'@': 37}), 18: (1, {'@': 37}), 19: (1, {'@': 37}), 20: (1, {'@': 37}), 21: (1, {'@': 37}), 22: (1, {'@': 37}), 23: (1, {'@': 37}), 24: (1, {'@': 37}), 25: (1, {'@': 37}), 9: (0, 18), 26: (0, 17)}, 36: {16: (1, {'@': 38}), 17: (1, {'@': 38}), 18: (1, {'@': 38}), 19: (1, {'@': 38}), 20: (1, {'@': 38}), 21: (1, {'@': 38}), 22: (1, {'@': 38}), 23: (1, {'@': 38}), 24: (1, {'@': 38}), 25: (1, {'@': 38}), 26: (0, 17), 9: (0, 18)}, 37: {20: (1, {'@': 39}), 22: (1, {'@': 39})}, 38: {0: (0, 1), 2: (0, 3), 4: (0, 5), 5: (0, 6), 3: (0, 46), 6: (0, 7), 7: (0, 8), 8: (0, 9), 9: (0, 10), 10: (0, 11), 11: (0, 12), 12: (0, 13), 13: (0, 14), 14: (0, 15), 15: (0, 16)}, 39: {28: (0, 47)}, 40: {17: (1, {'@': 40}), 18: (1, {'@': 40}), 19: (1, {'@': 40}), 20: (1, {'@': 40}), 21: (1, {'@': 40}), 22: (1, {'@': 40}), 23: (1, {'@': 40}), 24: (0, 20), 16: (0, 21)}, 41: {17: (1, {'@': 41}), 18: (1, {'@': 41}), 19: (1, {'@': 41}), 20: (1, {'@': 41}), 21: (1, {'@': 41}), 22: (1, {'@': 41}), 23: (1, {'@': 41}), 24: (0, 20), 16: (0, 21)}, 42: {17: (1, {'@': 42}), 18: (1, {'@': 42}), 19: (1, {'@': 42}), 20: (1, {'@': 42}), 21: (1, {'@': 42}), 22: (1, {'@': 42}), 23: (1, {'@': 42}), 24: (0, 20), 16: (0, 21)}, 43: {17: (1, {'@': 43}), 18: (1, {'@': 43}), 19: (1, {'@': 43}), 20: (1, {'@': 43}), 21: (1, {'@': 43}), 22: (1, {'@': 43}), 23: (1, {'@': 43}), 24: (0, 20), 16: (0, 21)}, 44: {26: (1, {'@': 44}), 18: (1, {'@': 44}), 20: (1, {'@': 44}), 21: (1, {'@': 44}), 22: (1, {'@': 44}), 24: (1, {'@': 44}), 25: (1, {'@': 44}), 16: (1, {'@': 44}), 17: (1, {'@': 44}), 9: (1, {'@': 44}), 28: (1, {'@': 44}), 19: (1, {'@': 44}), 23: (1, {'@': 44})}, 45: {25: (0, 48)}, 46: {20: (1, {'@': 45}), 22: (1, {'@': 45})}, 47: {14: (0, 49), 5: (0, 6), 7: (0, 8), 10: (0, 11)}, 48: {26: (1, {'@': 46}), 18: (1, {'@': 46}), 20: (1, {'@': 46}), 21: (1, {'@': 46}), 22: (1, {'@': 46}), 24: (1, {'@': 46}), 25: (1, {'@': 46}), 16: (1, {'@': 46}), 17: (1, {'@': 46}), 9: (1, {'@': 46}), 28: (1, {'@': 46}), 19: (1, {'@': 46}), 23: (1, {'@': 46})}, 49: {17: (1, {'@': 47}), 18: (1, {'@': 47}), 19: (1, {'@': 47}), 20: (1, {'@': 47}), 21: (1, {'@': 47}), 22: (1, {'@': 47}), 23: (1, {'@': 47})}}, 'start_state': 0, 'end_state': 19}, 'lexer_conf': {'tokens': [{'@': 0}, {'@': 1}, {'@': 2}, {'@': 3}, {'@': 4}, {'@': 5}, {'@': 6}, {'@': 7}, {'@': 8}, {'@': 9}, {'@': 10}, {'@': 11}, {'@': 12}, {'@': 13}, {'@': 14}, {'@': 15}, {'@': 16}, {'@': 17}], 'ignore': ['WS'], '__type__': 'LexerConf'}, '__type__': 'LALR_ContextualLexer'}, 'rules': [{'@': 32}, {'@': 20}, {'@': 21}, {'@': 29}, {'@': 27}, {'@': 22}, {'@': 31}, {'@': 19}, {'@': 41}, {'@': 40}, {'@': 43}, {'@': 42}, {'@': 47}, {'@': 18}, {'@': 37}, {'@': 38}, {'@': 30}, {'@': 36}, {'@': 35}, {'@': 26}, {'@': 23}, {'@': 33}, {'@': 46}, {'@': 44}, {'@': 25}, {'@': 28}, {'@': 34}, {'@': 24}, {'@': 39}, {'@': 45}], 'options': {'debug': False, 'keep_all_tokens': False, 'tree_class': None, 'cache_grammar': False, 'postlex': None, 'parser': 'lalr', 'lexer': 'contextual', 'transformer': None, 'start': 'start', 'profile': False, 'priority': None, 'ambiguity': 'auto', 'propagate_positions': False, 'lexer_callbacks': {}, 'maybe_placeholders': False}, '__type__': 'Lark'}
 )
 MEMO = (
-{0: {'name': 'INT', 'pattern': {'value': '(?:[0-9])+', 'flags': [], '__type__': 'PatternRE'}, 'priority': 1, '__type__': 'TerminalDef'}, 1: {'name': 'WS', 'pattern': {'value': '(?:[ \t\x0c\r\n])+', 'flags': [], '__type__': 'PatternRE'}, 'priority': 1, '__type__': 'TerminalDef'}, 2: {'name': 'CNAME', 'pattern': {'value': '(?:_|(?:[A-Z]|[a-z]))(?:(?:(?:_|(?:[A-Z]|[a-z]))|[0-9]))*', 'flags': [], '__type__': 'PatternRE'}, 'priority': 1, '__type__': 'TerminalDef'}, 3: {'name': 'COMMA', 'pattern': {'value': ',', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 4: {'name': 'PLUS', 'pattern': {'value': '+', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 5: {'name': 'MINUS', 'pattern': {'value': '-', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 6: {'name': 'STAR', 'pattern': {'value': '*', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 7: {'name': 'SLASH', 'pattern': {'value': '/', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 8: {'name': 'QMARK', 'pattern': {'value': '?', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 9: {'name': 'LPAR', 'pattern': {'value': '(', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 10: {'name': 'RPAR', 'pattern': {'value': ')', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 11: {'name': '__ANON_0', 'pattern': {'value': '...', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 12: {'origin': {'name': 'item', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'INT', 'filter_out': False, '__type__': 'Terminal'}], 'order': 4, 'alias': 'number', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 13: {'origin': {'name': 'start', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'dim', '__type__': 'NonTerminal'}], 'order': 0, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': False, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 14: {'origin': {'name': 'dim', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'ellipsis', '__type__': 'NonTerminal'}], 'order': 1, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 15: {'origin': {'name': 'item', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'CNAME', 'filter_out': False, '__type__': 'Terminal'}], 'order': 4, 'alias': 'name', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 16: {'origin': {'name': 'sum', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'product', '__type__': 'NonTerminal'}], 'order': 2, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 17: {'origin': {'name': 'ellipsis', '__type__': 'NonTerminal'}, 'expansion': [{'name': '__ANON_0', 'filter_out': True, '__type__': 'Terminal'}], 'order': 6, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': False, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 18: {'origin': {'name': 'dim', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'sum', '__type__': 'NonTerminal'}], 'order': 1, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 19: {'origin': {'name': 'dynamic', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'QMARK', 'filter_out': True, '__type__': 'Terminal'}], 'order': 7, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': False, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 20: {'origin': {'name': 'product', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'item', '__type__': 'NonTerminal'}], 'order': 3, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 21: {'origin': {'name': 'wildcard', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'STAR', 'filter_out': True, '__type__': 'Terminal'}], 'order': 5, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': False, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 22: {'origin': {'name': 'dim', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'dynamic', '__type__': 'NonTerminal'}], 'order': 1, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 23: {'origin': {'name': 'dim', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'wildcard', '__type__': 'NonTerminal'}], 'order': 1, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 24: {'origin': {'name': 'start', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'dim', '__type__': 'NonTerminal'}, {'name': '__anon_star_0', '__type__': 'NonTerminal'}], 'order': 0, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': False, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 25: {'origin': {'name': 'item', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'CNAME', 'filter_out': False, '__type__': 'Terminal'}, {'name': 'QMARK', 'filter_out': True, '__type__': 'Terminal'}], 'order': 4, 'alias': 'dynamic_name', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 26: {'origin': {'name': '__anon_star_0', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'COMMA', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'dim', '__type__': 'NonTerminal'}], 'order': 8, 'alias': None, 'options': None, '__type__': 'Rule'}, 27: {'origin': {'name': 'product', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'product', '__type__': 'NonTerminal'}, {'name': 'STAR', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'item', '__type__': 'NonTerminal'}], 'order': 3, 'alias': 'mul', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 28: {'origin': {'name': 'product', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'product', '__type__': 'NonTerminal'}, {'name': 'SLASH', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'item', '__type__': 'NonTerminal'}], 'order': 3, 'alias': 'div', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 29: {'origin': {'name': 'sum', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'sum', '__type__': 'NonTerminal'}, {'name': 'MINUS', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'product', '__type__': 'NonTerminal'}], 'order': 2, 'alias': 'sub', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 30: {'origin': {'name': 'sum', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'sum', '__type__': 'NonTerminal'}, {'name': 'PLUS', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'product', '__type__': 'NonTerminal'}], 'order': 2, 'alias': 'add', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 31: {'origin': {'name': 'item', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'LPAR', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'sum', '__type__': 'NonTerminal'}, {'name': 'RPAR', 'filter_out': True, '__type__': 'Terminal'}], 'order': 4, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 32: {'origin': {'name': '__anon_star_0', '__type__': 'NonTerminal'}, 'expansion': [{'name': '__anon_star_0', '__type__': 'NonTerminal'}, {'name': 'COMMA', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'dim', '__type__': 'NonTerminal'}], 'order': 8, 'alias': None, 'options': None, '__type__': 'Rule'}}
+{0: {'name': 'INT', 'pattern': {'value': '(?:[0-9])+', 'flags': [], '__type__': 'PatternRE'}, 'priority': 1, '__type__': 'TerminalDef'}, 1: {'name': 'WS', 'pattern': {'value': '(?:[ \t\x0c\r\n])+', 'flags': [], '__type__': 'PatternRE'}, 'priority': 1, '__type__': 'TerminalDef'}, 2: {'name': 'CNAME', 'pattern': {'value': '(?:_|(?:[A-Z]|[a-z]))(?:(?:(?:_|(?:[A-Z]|[a-z]))|[0-9]))*', 'flags': [], '__type__': 'PatternRE'}, 'priority': 1, '__type__': 'TerminalDef'}, 3: {'name': 'COMMA', 'pattern': {'value': ',', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 4: {'name': 'LESSTHAN', 'pattern': {'value': '<', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 5: {'name': '__ANON_0', 'pattern': {'value': '<=', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 6: {'name': 'MORETHAN', 'pattern': {'value': '>', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 7: {'name': '__ANON_1', 'pattern': {'value': '>=', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 8: {'name': 'PERCENT', 'pattern': {'value': '%', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 9: {'name': '__ANON_2', 'pattern': {'value': '==', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 10: {'name': 'PLUS', 'pattern': {'value': '+', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 11: {'name': 'MINUS', 'pattern': {'value': '-', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 12: {'name': 'STAR', 'pattern': {'value': '*', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 13: {'name': 'SLASH', 'pattern': {'value': '/', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 14: {'name': 'QMARK', 'pattern': {'value': '?', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 15: {'name': 'LPAR', 'pattern': {'value': '(', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 16: {'name': 'RPAR', 'pattern': {'value': ')', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 17: {'name': '__ANON_3', 'pattern': {'value': '...', 'flags': [], '__type__': 'PatternStr'}, 'priority': 1, '__type__': 'TerminalDef'}, 18: {'origin': {'name': 'sum', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'product', '__type__': 'NonTerminal'}], 'order': 3, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 19: {'origin': {'name': 'bounded', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'sum', '__type__': 'NonTerminal'}], 'order': 2, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 20: {'origin': {'name': 'start', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'dim', '__type__': 'NonTerminal'}], 'order': 0, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': False, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 21: {'origin': {'name': 'dim', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'bounded', '__type__': 'NonTerminal'}], 'order': 1, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 22: {'origin': {'name': 'dim', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'named_ellipsis', '__type__': 'NonTerminal'}], 'order': 1, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 23: {'origin': {'name': 'item', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'CNAME', 'filter_out': False, '__type__': 'Terminal'}], 'order': 5, 'alias': 'name', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 24: {'origin': {'name': 'dynamic', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'QMARK', 'filter_out': True, '__type__': 'Terminal'}], 'order': 9, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': False, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 25: {'origin': {'name': 'wildcard', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'STAR', 'filter_out': True, '__type__': 'Terminal'}], 'order': 6, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': False, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 26: {'origin': {'name': 'item', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'INT', 'filter_out': False, '__type__': 'Terminal'}], 'order': 5, 'alias': 'number', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 27: {'origin': {'name': 'dim', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'ellipsis', '__type__': 'NonTerminal'}], 'order': 1, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 28: {'origin': {'name': 'ellipsis', '__type__': 'NonTerminal'}, 'expansion': [{'name': '__ANON_3', 'filter_out': True, '__type__': 'Terminal'}], 'order': 7, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': False, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 29: {'origin': {'name': 'dim', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'wildcard', '__type__': 'NonTerminal'}], 'order': 1, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 30: {'origin': {'name': 'product', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'item', '__type__': 'NonTerminal'}], 'order': 4, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 31: {'origin': {'name': 'dim', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'dynamic', '__type__': 'NonTerminal'}], 'order': 1, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 32: {'origin': {'name': 'start', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'dim', '__type__': 'NonTerminal'}, {'name': '__anon_star_0', '__type__': 'NonTerminal'}], 'order': 0, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': False, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 33: {'origin': {'name': 'item', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'CNAME', 'filter_out': False, '__type__': 'Terminal'}, {'name': 'QMARK', 'filter_out': True, '__type__': 'Terminal'}], 'order': 5, 'alias': 'dynamic_name', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 34: {'origin': {'name': 'named_ellipsis', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'STAR', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'CNAME', 'filter_out': False, '__type__': 'Terminal'}], 'order': 8, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': False, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 35: {'origin': {'name': 'product', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'product', '__type__': 'NonTerminal'}, {'name': 'SLASH', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'item', '__type__': 'NonTerminal'}], 'order': 4, 'alias': 'div', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 36: {'origin': {'name': 'product', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'product', '__type__': 'NonTerminal'}, {'name': 'STAR', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'item', '__type__': 'NonTerminal'}], 'order': 4, 'alias': 'mul', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 37: {'origin': {'name': 'sum', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'sum', '__type__': 'NonTerminal'}, {'name': 'PLUS', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'product', '__type__': 'NonTerminal'}], 'order': 3, 'alias': 'add', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 38: {'origin': {'name': 'sum', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'sum', '__type__': 'NonTerminal'}, {'name': 'MINUS', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'product', '__type__': 'NonTerminal'}], 'order': 3, 'alias': 'sub', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 39: {'origin': {'name': '__anon_star_0', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'COMMA', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'dim', '__type__': 'NonTerminal'}], 'order': 10, 'alias': None, 'options': None, '__type__': 'Rule'}, 40: {'origin': {'name': 'bounded', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'bounded', '__type__': 'NonTerminal'}, {'name': '__ANON_0', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'sum', '__type__': 'NonTerminal'}], 'order': 2, 'alias': 'le', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 41: {'origin': {'name': 'bounded', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'bounded', '__type__': 'NonTerminal'}, {'name': 'LESSTHAN', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'sum', '__type__': 'NonTerminal'}], 'order': 2, 'alias': 'lt', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 42: {'origin': {'name': 'bounded', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'bounded', '__type__': 'NonTerminal'}, {'name': '__ANON_1', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'sum', '__type__': 'NonTerminal'}], 'order': 2, 'alias': 'ge', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 43: {'origin': {'name': 'bounded', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'bounded', '__type__': 'NonTerminal'}, {'name': 'MORETHAN', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'sum', '__type__': 'NonTerminal'}], 'order': 2, 'alias': 'gt', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 44: {'origin': {'name': 'item', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'LPAR', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'sum', '__type__': 'NonTerminal'}, {'name': 'RPAR', 'filter_out': True, '__type__': 'Terminal'}], 'order': 5, 'alias': None, 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 45: {'origin': {'name': '__anon_star_0', '__type__': 'NonTerminal'}, 'expansion': [{'name': '__anon_star_0', '__type__': 'NonTerminal'}, {'name': 'COMMA', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'dim', '__type__': 'NonTerminal'}], 'order': 10, 'alias': None, 'options': None, '__type__': 'Rule'}, 46: {'origin': {'name': 'item', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'CNAME', 'filter_out': False, '__type__': 'Terminal'}, {'name': 'LPAR', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'CNAME', 'filter_out': False, '__type__': 'Terminal'}, {'name': 'RPAR', 'filter_out': True, '__type__': 'Terminal'}], 'order': 5, 'alias': 'call', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}, 47: {'origin': {'name': 'bounded', '__type__': 'NonTerminal'}, 'expansion': [{'name': 'bounded', '__type__': 'NonTerminal'}, {'name': 'PERCENT', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'item', '__type__': 'NonTerminal'}, {'name': '__ANON_2', 'filter_out': True, '__type__': 'Terminal'}, {'name': 'item', '__type__': 'NonTerminal'}], 'order': 2, 'alias': 'divisible', 'options': {'keep_all_tokens': False, 'expand1': True, 'priority': None, 'empty_indices': (), '__type__': 'RuleOptions'}, '__type__': 'Rule'}}
 )
 Shift = 0
 Reduce = 1
@@ -0,0 +1,230 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Validates feature lengths of tf.train.Examples in TFRecord shards.
+
+Records are read with a small pure-Python reader and only the protobuf
+wire format is walked to count the values of each feature, so no tensors
+are ever created. Templates of different features share named dims within
+each record (e.g. {"tokens": "T", "labels": "T"}).
+"""
+
+import concurrent.futures
+import gzip
+import struct
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from shapeguard import parser
+from shapeguard import tools
+
+# feature is None if the record could not be decoded
+Violation = namedtuple("Violation", ["path", "index", "offset", "feature", "message"])
+
+_BUFFER_SIZE = 1 << 20
+
+
+def read_records(
+    path: str, compression: Optional[str] = None
+) -> Iterator[Tuple[int, bytes]]:
+    """Yield (byte offset, serialized record) for each record of a shard.
+
+    The CRCs are not verified. Offsets of GZIP shards refer to the
+    uncompressed stream.
+    """
+    if compression == "GZIP":
+        f = gzip.open(path, "rb")
+    elif compression is None:
+        f = open(path, "rb", buffering=_BUFFER_SIZE)
+    else:
+        raise ValueError("Unsupported compression: {}".format(compression))
+    with f:
+        offset = 0
+        while True:
+            header = f.read(12)  # uint64 length, uint32 crc of length
+            if not header:
+                return
+            if len(header) < 12:
+                raise ValueError("Truncated record at offset {}".format(offset))
+            (length,) = struct.unpack("<Q", header[:8])
+            data = f.read(length)
+            if len(data) < length or len(f.read(4)) < 4:
+                raise ValueError("Truncated record at offset {}".format(offset))
+            yield offset, data
+            offset += length + 16
+
+
+def _varint(buf: memoryview, pos: int, end: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        if pos >= end:
+            raise ValueError("Truncated varint at byte {}".format(pos))
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fields(buf: memoryview, pos: int, end: int) -> Iterator[Tuple[int, int, int, int]]:
+    """Yield (field number, wire type, start, end) of each field in buf[pos:end].
+
+    Raises:
+      ValueError: if a field is corrupt or exceeds buf[pos:end].
+    """
+    while pos < end:
+        key, pos = _varint(buf, pos, end)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            _, value_end = _varint(buf, pos, end)
+        elif wire_type == 1:
+            value_end = pos + 8
+        elif wire_type == 2:
+            length, pos = _varint(buf, pos, end)
+            value_end = pos + length
+        elif wire_type == 5:
+            value_end = pos + 4
+        else:
+            raise ValueError("Unsupported wire type {}".format(wire_type))
+        if value_end > end:
+            raise ValueError("Truncated field {} at byte {}".format(field, pos))
+        yield field, wire_type, pos, value_end
+        pos = value_end
+
+
+def _list_length(buf: memoryview, pos: int, end: int) -> int:
+    """Number of values in a Feature (bytes_list=1, float_list=2, int64_list=3)."""
+    count = 0
+    for kind, _, list_start, list_end in _fields(buf, pos, end):
+        for field, wire_type, start, stop in _fields(buf, list_start, list_end):
+            if field != 1:
+                continue
+            if wire_type == 2 and kind == 2:  # packed floats
+                count += (stop - start) // 4
+            elif wire_type == 2 and kind == 3:  # packed varints
+                count += int(
+                    np.count_nonzero(np.frombuffer(buf[start:stop], np.uint8) < 0x80)
+                )
+            else:  # bytes or unpacked values
+                count += 1
+    return count
+
+
+def feature_lengths(record: bytes) -> Dict[str, int]:
+    """Return the number of values of each feature of a serialized Example.
+
+    Raises:
+      ValueError: if the record is not a valid Example.
+    """
+    buf = memoryview(record)
+    lengths = {}
+    for field, wire_type, start, end in _fields(buf, 0, len(buf)):
+        if field != 1 or wire_type != 2:  # Example.features
+            continue
+        for entry, _, entry_start, entry_end in _fields(buf, start, end):
+            if entry != 1:  # Features.feature (map entries)
+                continue
+            name, length = "", 0
+            for f, _, s, e in _fields(buf, entry_start, entry_end):
+                if f == 1:
+                    name = bytes(buf[s:e]).decode("utf-8")
+                elif f == 2:
+                    length = _list_length(buf, s, e)
+            lengths[name] = length
+    return lengths
+
+
+def check_lengths(
+    lengths: Dict[str, int], templates: Dict[str, str], dims: Dict[str, int]
+) -> Optional[Tuple[str, str]]:
+    """Return (feature, message) of the first violated template or None."""
+    known_dims = dict(dims)
+    for feature, template in templates.items():
+        if feature not in lengths:
+            return feature, 'Missing feature "{}"'.format(feature)
+        result = tools.check_spec(
+            [lengths[feature]], parser.parse(template), known_dims, template
+        )
+        if not result:
+            return feature, result.message
+        known_dims.update(result.dims)
+    return None
+
+
+def validate_shard(
+    path: str,
+    templates: Dict[str, str],
+    dims: Optional[Dict[str, int]] = None,
+    compression: Optional[str] = None,
+) -> List[Violation]:
+    """Check the feature lengths of every record in a shard.
+
+    Args:
+      path: str. The TFRecord file.
+      templates: Dict[str, str]. Template of each feature, e.g. "T" or "T*D".
+        Named dims are shared between the features of a record.
+      dims: Dict[str, int]. Dims that are fixed for all records.
+      compression: None or "GZIP".
+
+    Returns:
+      List of Violations with the index and byte offset of each bad record
+      (including records that cannot be decoded).
+    """
+    dims = dims or {}
+    violations = []
+    for index, (offset, record) in enumerate(read_records(path, compression)):
+        try:
+            lengths = feature_lengths(record)
+        except ValueError as e:
+            violations.append(Violation(path, index, offset, None, str(e)))
+            continue
+        failure = check_lengths(lengths, templates, dims)
+        if failure is not None:
+            violations.append(Violation(path, index, offset, *failure))
+    return violations
+
+
+def validate(
+    paths: Sequence[str],
+    templates: Dict[str, str],
+    dims: Optional[Dict[str, int]] = None,
+    compression: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 4,
+    threads: bool = False,
+) -> List[Violation]:
+    """Validate shards in parallel (see validate_shard).
+
+    Shards are sent to the worker processes in batches of chunksize, which
+    saves round trips for many small shards. With threads=True a thread pool
+    is used instead (no parallel decoding, but no fork either).
+    """
+    executor_cls = (
+        concurrent.futures.ThreadPoolExecutor
+        if threads
+        else concurrent.futures.ProcessPoolExecutor
+    )
+    with executor_cls(max_workers=workers) as executor:
+        results = executor.map(
+            validate_shard,
+            paths,
+            [templates] * len(paths),
+            [dims] * len(paths),
+            [compression] * len(paths),
+            chunksize=chunksize,
+        )
+        return [v for shard_violations in results for v in shard_violations]
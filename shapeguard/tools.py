@@ -14,16 +14,34 @@
 
 """Contains the main ShapeGuard class."""
 
-from copy import copy
-
-from typing import List, Tuple, Dict, Union, Optional
+import os
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
 
 import numpy as np
 import tensorflow as tf
 import tensorflow_probability as tfp
 
+from shapeguard import arrow
+from shapeguard import backend
+from shapeguard import dim_specs
 from shapeguard import exception
+from shapeguard import headers
 from shapeguard import parser
+from shapeguard import plans
+from shapeguard import shape_spec
+
+if TYPE_CHECKING:  # avoid importing trace when running it as a script
+    from shapeguard import trace
 
 Tensor = Union[np.ndarray, tf.Tensor]
 
@@ -34,10 +52,55 @@ def matches(tensor: Tensor, template: str, dims: Dict[str, int]) -> bool:
     return spec.matches(shape, dims)
 
 
-def reshape(tensor: Tensor, template: str, dims: Dict[str, int]) -> Tensor:
+def reshape(
+    tensor: Tensor, template: str, dims: Dict[str, int], allow_copy: bool = True
+) -> Tensor:
     spec = parser.parse(template)
     new_shape = spec.evaluate(dims)
-    return tf.reshape(tensor, new_shape)
+    if _has_shape(tensor, new_shape):
+        return tensor
+    return backend.reshape(tensor, new_shape, allow_copy)
+
+
+def _has_shape(tensor: Tensor, shape: List[Optional[int]]) -> bool:
+    if isinstance(tensor, (list, tuple)):
+        return False  # get_shape would interpret these as shapes
+    if not all(s is None or isinstance(s, int) for s in shape):
+        return False  # symbolic entries
+    try:
+        return get_shape(tensor) == shape
+    except TypeError:
+        return False
+
+
+def rearrange(
+    tensor: Tensor, pattern: str, dims: Dict[str, int], reduction: Optional[str] = None
+) -> Tensor:
+    plan = plans.rearrange_plan(pattern)
+    guard_spec(tensor, plan.input_spec, dims, plan.input_template)
+    # unlike the guarded dims, these include private dims (e.g. "_B")
+    known_dims = plan.input_spec.infer(get_shape(tensor), dims)
+    return plan.apply(tensor, known_dims, reduction)
+
+
+def einsum(pattern: str, operands: Sequence[Tensor], dims: Dict[str, int]) -> Tensor:
+    plan = plans.einsum_plan(pattern)
+    known_dims = dims
+    for op, spec, template in plan.inputs(operands):
+        known_dims = guard_spec(op, spec, known_dims, template)
+    return plan.apply(*operands)
+
+
+def expand(tensor: Tensor, source: str, target: str, dims: Dict[str, int]) -> Tensor:
+    plan = plans.broadcast_plan(source, target)
+    guard_spec(tensor, plan.source_spec, dims, source)
+    return plan.expand(tensor, get_shape(tensor))
+
+
+def broadcast(tensor: Tensor, source: str, target: str, dims: Dict[str, int]) -> Tensor:
+    plan = plans.broadcast_plan(source, target)
+    known_dims = guard_spec(tensor, plan.source_spec, dims, source)
+    return plan.broadcast(tensor, get_shape(tensor), known_dims)
 
 
 def evaluate(template: str, dims: Dict[str, int]) -> List[Optional[int]]:
@@ -45,43 +108,261 @@ def evaluate(template: str, dims: Dict[str, int]) -> List[Optional[int]]:
     return dim_spec.evaluate(dims)
 
 
-def guard(tensor: Tensor, template: str, dims: Dict[str, int]):
-    shape = get_shape(tensor)
+def tensor_spec(
+    template: str,
+    dims: Dict[str, int],
+    dtype: tf.DType = tf.float32,
+    name: Optional[str] = None,
+) -> tf.TensorSpec:
+    """Return a TensorSpec where only the fixed dims of the template are static.
+
+    Known dims and numbers stay static, while "?" dims, wildcards and unknown
+    dims are None. A tf.function with such specs as input_signature is traced
+    only once for all inputs that match the template.
+    """
     spec = parser.parse(template)
-    # compare rank
-    if not spec.rank_matches(shape):
-        raise exception.ShapeError(
-            "Tensor has the wrong rank ({} != {}).\n"
-            "Expected shape: {} (from template {})\n"
-            "  Actual shape: {}".format(
-                len(shape), len(spec), spec.partial_evaluate(dims), template, shape
+    return tf.TensorSpec(spec.static_shape(dims), dtype, name)
+
+
+SignatureEntry = Union[str, Tuple[str, tf.DType]]
+
+
+def input_signature(
+    templates: Sequence[SignatureEntry],
+    dims: Dict[str, int],
+    dtype: tf.DType = tf.float32,
+) -> List[tf.TensorSpec]:
+    """Turn templates or (template, dtype) pairs into an input_signature."""
+    signature = []
+    for template in templates:
+        if isinstance(template, tuple):
+            template, arg_dtype = template
+        else:
+            arg_dtype = dtype
+        signature.append(tensor_spec(template, dims, arg_dtype))
+    return signature
+
+
+def shape_dtype_struct(template: str, dims: Dict[str, int], dtype=np.float32):
+    """Return a jax.ShapeDtypeStruct (e.g. as input for jax.eval_shape).
+
+    Raises:
+      UnderspecifiedShapeError: if the template does not evaluate to a
+        fully known shape.
+    """
+    import jax
+
+    shape = parser.parse(template).evaluate(dims)
+    if None in shape or -1 in shape:
+        raise exception.UnderspecifiedShapeError(
+            'Template "{}" evaluates to {}, which is not fully known.'.format(
+                template, shape
             )
         )
-    # infer dimensions
-    inferred_dims = spec.infer(shape, dims)
-    known_dims = copy(dims)
-    known_dims.update(inferred_dims)
-    # check if dimensions match
-    if not spec.matches(shape, known_dims):
-        raise exception.ShapeError(
+    return jax.ShapeDtypeStruct(tuple(shape), dtype)
+
+
+class CheckResult:
+    """Outcome of a non-raising shape check (see `check`).
+
+    Attributes:
+      ok: bool. True if the shape matches the template.
+      dims: Dict[str, int]. Inferred dims (empty if the check failed).
+      index: int or None. Axis of the first conflicting entry or None if the
+        check succeeded or the rank did not match.
+
+    The human-readable error message is only formatted when `message` is
+    accessed, so rejecting a shape costs about as much as accepting one.
+    """
+
+    def __init__(
+        self,
+        ok: bool,
+        dims: Dict[str, int],
+        index: Optional[int],
+        template: str,
+        spec: shape_spec.ShapeSpec,
+        shape: List[int],
+        known_dims: Dict[str, int],
+    ):
+        self.ok = ok
+        self.dims = dims
+        self.index = index
+        self.template = template
+        self.spec = spec
+        self.shape = shape
+        self.known_dims = known_dims
+
+    @property
+    def message(self) -> str:
+        if self.ok:
+            return ""
+        expected = self.spec.partial_evaluate(self.known_dims)
+        if not self.spec.rank_matches(self.shape):
+            return (
+                "Tensor has the wrong rank ({} != {}).\n"
+                "Expected shape: {} (from template {})\n"
+                "  Actual shape: {}".format(
+                    len(self.shape), len(self.spec), expected, self.template, self.shape
+                )
+            )
+        return (
             "Shape Mismatch\n"
             "Expected shape: {} (from template {})\n"
-            "  Actual shape: {}".format(spec.partial_evaluate(dims), template, shape)
+            "  Actual shape: {}".format(expected, self.template, self.shape)
         )
 
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def __repr__(self) -> str:
+        return "<CheckResult ok={} dims={} index={}>".format(
+            self.ok, self.dims, self.index
+        )
+
+
+def check(tensor: Tensor, template: str, dims: Dict[str, int]) -> CheckResult:
+    return check_spec(get_shape(tensor), parser.parse(template), dims, template)
+
+
+def check_spec(
+    shape: List[int],
+    spec: shape_spec.ShapeSpec,
+    dims: Dict[str, int],
+    template: str,
+) -> CheckResult:
+    # failures keep a snapshot of dims, since their message is formatted lazily
+    # compare rank
+    if not spec.rank_matches(shape):
+        return CheckResult(False, {}, None, template, spec, shape, dict(dims))
+    # infer dimensions
+    known_dims = spec.infer(shape, dims)
+    # check if dimensions match
+    index = spec.first_conflict(shape, known_dims)
+    if index is not None:
+        return CheckResult(False, {}, index, template, spec, shape, dict(dims))
     # return the inferred dims unless they start with '_'
-    return {k: v for k, v in inferred_dims.items() if not k.startswith("_")}
+    inferred_dims = {k: v for k, v in known_dims.items() if not k.startswith("_")}
+    return CheckResult(True, inferred_dims, None, template, spec, shape, dims)
+
+
+def refined_shape(
+    spec: shape_spec.ShapeSpec, shape: List[Optional[int]], dims: Dict[str, int]
+) -> List[Optional[int]]:
+    """Replace the None entries of shape by their values under dims (if known)."""
+    refined = list(shape)
+    for axis, s, e in spec.axis_iter(shape):
+        if s is not None:
+            continue
+        try:
+            value = e.evaluate(dims)
+        except exception.UnderspecifiedShapeError:
+            continue
+        if isinstance(value, int) and value >= 0:
+            refined[axis] = value
+    return refined
+
+
+def bind_symbolic_dims(
+    tensor: tf.Tensor,
+    spec: shape_spec.ShapeSpec,
+    shape: List[Optional[int]],
+    known_dims: Mapping[str, Any],
+) -> Dict[str, tf.Tensor]:
+    """Bind unknown named dims at dynamic (None) axes to tf.shape(tensor)[axis].
+
+    All bound dims share a single tf.shape op.
+    """
+    dynamic_shape = None
+    symbolic_dims: Dict[str, tf.Tensor] = {}
+    for axis, s, e in spec.axis_iter(shape):
+        e = e.base()
+        if s is not None or not isinstance(e, dim_specs.NamedDim):
+            continue
+        if e.name in known_dims or e.name in symbolic_dims or e.name.startswith("_"):
+            continue
+        if dynamic_shape is None:
+            dynamic_shape = tf.shape(tensor)
+        symbolic_dims[e.name] = dynamic_shape[axis]
+    return symbolic_dims
+
+
+def guard(
+    tensor: Tensor,
+    template: str,
+    dims: Dict[str, int],
+    recorder: Optional["trace.TraceRecorder"] = None,
+):
+    spec = parser.parse(template)
+    known_dims = guard_spec(tensor, spec, dims, template)
+    if recorder is not None:
+        recorder.record(spec, template, get_shape(tensor), known_dims)
+    return known_dims
+
+
+def guard_spec(
+    tensor: Tensor, spec: shape_spec.ShapeSpec, dims: Dict[str, int], template: str
+) -> Dict[str, int]:
+    result = check_spec(get_shape(tensor), spec, dims, template)
+    if not result:
+        raise exception.ShapeError(result.message)
+    return result.dims
+
+
+def guard_chunks(
+    array, template: str, dims: Dict[str, int], aligned: bool = False
+) -> None:
+    """Check the storage chunks of an h5py.Dataset or zarr.Array.
+
+    Args:
+      array: h5py.Dataset or zarr.Array.
+      template: str. Template of the chunk shape, e.g. "1, H, W, C" for
+        per-sample reads. Dims inferred from it are not returned.
+      dims: Dict[str, int]. Known dims (e.g. from guarding the array).
+      aligned: bool. If True, every chunk size also has to divide the size
+        of its axis, so no read touches a partial chunk.
+
+    Raises:
+      ShapeError: if the chunks do not match the template or are not aligned.
+    """
+    chunks = backend.chunk_shape(array)
+    result = check_spec(chunks, parser.parse(template), dims, template)
+    if not result:
+        raise exception.ShapeError("Storage chunks:\n" + result.message)
+    if aligned:
+        shape = get_shape(array)
+        for axis, (size, chunk) in enumerate(zip(shape, chunks)):
+            if size % chunk:
+                raise exception.ShapeError(
+                    "Chunks {} are not aligned with shape {} (axis {}).".format(
+                        chunks, shape, axis
+                    )
+                )
 
 
 def get_shape(tensor_or_shape: Union[Tensor, Tuple[int], List[int]]) -> List[int]:
     if isinstance(tensor_or_shape, (list, tuple)):
         return list(tensor_or_shape)
+    elif isinstance(tensor_or_shape, (str, os.PathLike)):
+        # only the header is read (see headers.READERS)
+        return headers.file_shape(tensor_or_shape)
     elif isinstance(tensor_or_shape, tf.Tensor):
         return tensor_or_shape.get_shape().as_list()
     elif isinstance(tensor_or_shape, tf.TensorShape):
         return tensor_or_shape.as_list()
+    elif isinstance(tensor_or_shape, (tf.RaggedTensor, tf.SparseTensor)):
+        # static shape only (ragged dims are None), values are never touched
+        return tensor_or_shape.shape.as_list()
     elif isinstance(tensor_or_shape, np.ndarray):
         return list(tensor_or_shape.shape)
+    elif backend.is_torch(tensor_or_shape) or backend.is_jax(tensor_or_shape):
+        return list(tensor_or_shape.shape)
+    elif backend.is_shape_dtype_struct(tensor_or_shape):
+        return list(tensor_or_shape.shape)
+    elif backend.is_stored_array(tensor_or_shape):
+        return list(tensor_or_shape.shape)  # metadata only
+    elif backend.is_arrow(tensor_or_shape):
+        return arrow.arrow_shape(tensor_or_shape)
     elif isinstance(tensor_or_shape, tfp.distributions.Distribution):
         return (
             tensor_or_shape.batch_shape.as_list()
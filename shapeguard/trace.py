@@ -0,0 +1,181 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Records observed shapes and summarizes them (python -m shapeguard.trace)."""
+
+import os
+import pickle
+import sys
+import time
+from collections import Counter, deque, namedtuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from shapeguard import shape_spec
+
+Record = namedtuple("Record", ["time", "site", "template", "shape", "dims"])
+
+HEADER = ("shapeguard-trace", 1)
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def call_site() -> str:
+    """Return "file:line" of the innermost caller outside of shapeguard."""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename.startswith(_PACKAGE_DIR):
+        frame = frame.f_back
+    if frame is None:
+        return "<unknown>"
+    return "{}:{}".format(frame.f_code.co_filename, frame.f_lineno)
+
+
+class TraceRecorder:
+    """Records (template, shape, dims) of every successful guard call.
+
+    Records are kept in a ring buffer of the last `maxlen` calls. If a path
+    is given, they are also appended to that file as a stream of pickled
+    tuples. Call sites and templates are interned, so each record only
+    stores a timestamp, a site id, the shape and the dims of the template.
+
+    Args:
+      path: str or None. File to append the records to.
+      maxlen: int or None. Size of the in-memory ring buffer.
+    """
+
+    def __init__(self, path: Optional[str] = None, maxlen: Optional[int] = 10000):
+        self.records: deque = deque(maxlen=maxlen)
+        self.sites: Dict[Tuple[str, str], int] = {}
+        self.file = None
+        if path is not None:
+            self.file = open(path, "ab")
+            pickle.dump(HEADER, self.file)
+
+    def record(
+        self,
+        spec: shape_spec.ShapeSpec,
+        template: str,
+        shape: List[Optional[int]],
+        dims: Dict[str, Any],
+    ) -> None:
+        site = call_site()
+        names = {n for e in spec.entries for n in e.names()}
+        template_dims = tuple((n, v) for n, v in dims.items() if n in names)
+        timestamp = time.time()
+        self.records.append(
+            Record(timestamp, site, template, tuple(shape), dict(template_dims))
+        )
+        if self.file is not None:
+            key = (site, template)
+            if key not in self.sites:
+                self.sites[key] = len(self.sites)
+                pickle.dump(("site", self.sites[key], site, template), self.file)
+            pickle.dump(
+                (timestamp, self.sites[key], tuple(shape), template_dims), self.file
+            )
+
+    def flush(self) -> None:
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+
+def load(path: str) -> List[Record]:
+    """Read all records from a file written by one or more TraceRecorders."""
+    records = []
+    sites: Dict[int, Tuple[str, str]] = {}
+    with open(path, "rb") as f:
+        while True:
+            try:
+                entry = pickle.load(f)
+            except EOFError:
+                break
+            if entry == HEADER:
+                sites = {}  # site ids are local to each recorder
+            elif entry[0] == "site":
+                _, site_id, site, template = entry
+                sites[site_id] = (site, template)
+            else:
+                timestamp, site_id, shape, dims = entry
+                site, template = sites[site_id]
+                records.append(Record(timestamp, site, template, shape, dict(dims)))
+    return records
+
+
+def summarize(records: Iterable[Record]) -> Dict[str, Any]:
+    """Summarize records.
+
+    Returns:
+      Dict with the keys
+        "sites": {(site, template): Counter of shapes},
+        "dims": {name: Counter of values},
+        "varying": sorted names of dims that took more than one value.
+    """
+    sites: Dict[Tuple[str, str], Counter] = {}
+    dims: Dict[str, Counter] = {}
+    for r in records:
+        sites.setdefault((r.site, r.template), Counter())[r.shape] += 1
+        for name, value in r.dims.items():
+            dims.setdefault(name, Counter())[value] += 1
+    varying = sorted(name for name, values in dims.items() if len(values) > 1)
+    return {"sites": sites, "dims": dims, "varying": varying}
+
+
+def format_report(records: Iterable[Record]) -> str:
+    summary = summarize(records)
+    lines = ["Call sites:"]
+    for (site, template), shapes in sorted(summary["sites"].items()):
+        lines.append(
+            '  {} "{}": {} calls, {} distinct shapes'.format(
+                site, template, sum(shapes.values()), len(shapes)
+            )
+        )
+        for shape, count in shapes.most_common():
+            lines.append("    {}: {}".format(list(shape), count))
+    lines.append("Dims:")
+    for name, values in sorted(summary["dims"].items()):
+        histogram = ", ".join(
+            "{}: {}".format(v, c) for v, c in sorted(values.items(), key=str)
+        )
+        lines.append("  {}: {{{}}}".format(name, histogram))
+    lines.append("Varying dims: {}".format(", ".join(summary["varying"]) or "none"))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("usage: python -m shapeguard.trace TRACE_FILE", file=sys.stderr)
+        return 2
+    print(format_report(load(argv[0])))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
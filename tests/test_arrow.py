@@ -0,0 +1,71 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from shapeguard import ShapeGuard
+from shapeguard import get_shape
+from shapeguard.headers import array_shapes
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def fixed_size_list(values, *sizes):
+    array = pa.array(values)
+    for size in reversed(sizes):
+        array = pa.FixedSizeListArray.from_arrays(array, size)
+    return array
+
+
+def test_fixed_size_lists():
+    assert get_shape(pa.array([1, 2, 3])) == [3]
+    assert get_shape(fixed_size_list(np.arange(24.0), 3, 4)) == [2, 3, 4]
+    assert get_shape(fixed_size_list(np.arange(24.0), 3, 4)[1:]) == [1, 3, 4]
+
+
+def test_fixed_shape_tensor_and_chunked():
+    tensors = pa.FixedShapeTensorArray.from_numpy_ndarray(np.zeros([4, 2, 3]))
+    assert get_shape(tensors) == [4, 2, 3]
+    chunked = pa.chunked_array([tensors, tensors])
+    sg = ShapeGuard()
+    sg.guard(chunked, "N, H, W")
+    assert sg.dims == {"N": 8, "H": 2, "W": 3}
+
+
+def test_variable_size_lists():
+    assert get_shape(pa.array([[1, 2], [3, 4]])) == [2, 2]
+    ragged = pa.chunked_array([pa.array([[1, 2], [3]]), pa.array([[4, 5]])])
+    assert get_shape(ragged) == [3, None]
+    ShapeGuard().guard(ragged, "B, ragged(T)")
+
+
+def test_parquet_shapes(tmp_path):
+    table = pa.table(
+        {
+            "image": pa.FixedShapeTensorArray.from_numpy_ndarray(np.zeros([4, 2, 3])),
+            "embedding": fixed_size_list(np.arange(32.0), 8),
+            "tokens": pa.array([[1], [2, 3], [], [4]]),
+        }
+    )
+    path = tmp_path / "data.parquet"
+    pq.write_table(table, path)
+    assert array_shapes(path) == {
+        "image": [4, 2, 3],
+        "embedding": [4, 8],
+        "tokens": [4, None],
+    }
+    with pytest.raises(ValueError):
+        get_shape(path)
@@ -0,0 +1,56 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import numpy as np
+
+from shapeguard import audit
+from shapeguard.__main__ import main
+
+
+def test_parse_rule():
+    assert audit.parse_rule("*.npy=H, W, C") == ("*.npy", None, "H, W, C")
+    assert audit.parse_rule("*.npz:x=D%8==0") == ("*.npz", "x", "D%8==0")
+
+
+def test_audit(tmp_path):
+    for i, channels in enumerate([3, 3, 1]):
+        np.save(tmp_path / "img{}.npy".format(i), np.zeros([i + 2, 4, channels]))
+    np.savez(tmp_path / "a.npz", x=np.zeros([4, 2]), y=np.zeros([4]))
+    np.savez(tmp_path / "b.npz", x=np.zeros([4, 2]), y=np.zeros([3]))
+    (tmp_path / "notes.txt").write_text("not an array")
+    rules = [
+        audit.parse_rule(r) for r in ["*.npy=_H, W, C", "*.npz:x=B, D", "*.npz:y=B"]
+    ]
+    report = audit.audit([str(tmp_path)], rules, dims={"W": 4}, threads=True)
+    assert report["files"] == 6
+    assert report["checked"] == 5
+    assert report["dims"] == {"W": 4, "C": 3, "B": 4, "D": 2}
+    assert [(v["file"], v["key"]) for v in report["violations"]] == [
+        (str(tmp_path / "b.npz"), "y")
+    ]
+    assert report["conflicts"] == {
+        "C": {"values": [3, 1], "files": [str(tmp_path / "img2.npy")]}
+    }
+
+
+def test_main_writes_report(tmp_path):
+    np.save(tmp_path / "x.npy", np.zeros([2, 3]))
+    report_path = str(tmp_path / "report.json")
+    args = ["audit", str(tmp_path / "*.npy"), "-r", "*.npy=N, 3", "--threads"]
+    assert main(args + ["--report", report_path]) == 0
+    assert json.load(open(report_path))["dims"] == {"N": 2}
+    assert main(["audit", str(tmp_path), "-r", "*.npy=N, 4", "--threads"]) == 1
+    assert main(["unknown"]) == 2
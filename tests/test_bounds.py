@@ -0,0 +1,69 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from shapeguard import ShapeError
+from shapeguard import ShapeGuard
+from shapeguard import dispatch
+from shapeguard import parser
+from shapeguard.dim_specs import Divisible, LessEqual, NamedDim, Number
+
+
+def test_parse_bounds():
+    spec = parser.parse("B, T<=4096, D%8==0")
+    assert spec.entries[1] == LessEqual(NamedDim("T"), Number(4096))
+    assert spec.entries[2] == Divisible(NamedDim("D"), Number(8), Number(0))
+    assert repr(parser.parse("T>=1<L").entries[0]) == "T>=1<L"
+    assert spec.entries[1].base() == NamedDim("T")
+
+
+def test_divisor_must_not_be_zero():
+    with pytest.raises(ValueError):
+        parser.parse("D%0==0")
+    sg = ShapeGuard(dims={"K": 0})
+    with pytest.raises(ValueError):
+        sg.guard(np.ones([4]), "D%K==0")
+
+
+@pytest.mark.parametrize(
+    "shape, ok",
+    [([2, 100, 16], True), ([2, 5000, 16], False), ([2, 100, 12], False)],
+)
+def test_guard_bounds(shape, ok):
+    sg = ShapeGuard()
+    assert sg.matches(np.ones(shape), "B, T<=4096, D%8==0") == ok
+    if ok:
+        sg.guard(np.ones(shape), "B, T<=4096, D%8==0")
+        assert sg.dims == {"B": 2, "T": 100, "D": 16}
+    else:
+        with pytest.raises(ShapeError):
+            sg.guard(np.ones(shape), "B, T<=4096, D%8==0")
+
+
+def test_bound_on_unknown_dim_is_checked_once_known():
+    sg = ShapeGuard()
+    sg.guard([3, 10], "B, T<=max_len")
+    with pytest.raises(ShapeError):
+        sg.max_len = 8
+
+
+def test_bounds_with_dynamic_dims_and_dispatch():
+    sg = ShapeGuard(dims={"T": 10})
+    assert sg.guard([None, 3], "T?<=512, C") == [None, 3]
+    assert parser.parse("T?<=512, C").static_shape({"T": 10, "C": 3}) == [None, 3]
+    apply = dispatch({"B, T<=512": "short", "B, T": "long"}, warn_overlaps=False)
+    assert apply([2, 100])[0] == "short"
+    assert apply([2, 1000])[0] == "long"
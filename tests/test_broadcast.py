@@ -0,0 +1,58 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from shapeguard import ShapeError
+from shapeguard import ShapeGuard
+
+
+def test_expand_inserts_dims():
+    sg = ShapeGuard()
+    bias = np.ones([2, 4])
+    expanded = sg.expand(bias, "B, D", "B, T, 1, D")
+    assert expanded.shape == (2, 1, 1, 4)
+    assert np.shares_memory(expanded, bias)
+
+
+def test_broadcast_numpy_is_a_view():
+    sg = ShapeGuard(dims={"T": 3})
+    bias = np.arange(8.0).reshape([2, 4])
+    b = sg.broadcast(bias, "B, D", "B, T, D")
+    assert b.shape == (2, 3, 4)
+    assert b.strides[1] == 0
+    assert np.shares_memory(b, bias)
+    np.testing.assert_array_equal(b[:, 2], bias)
+
+
+def test_broadcast_with_ellipsis():
+    sg = ShapeGuard(dims={"T": 3})
+    assert sg.broadcast(np.ones([5, 6, 4]), "..., D", "..., T, D").shape == (5, 6, 3, 4)
+
+
+def test_broadcast_tensorflow_is_not_materialized():
+    sg = ShapeGuard(dims={"T": 3})
+    b = sg.broadcast(tf.ones([2, 4]), "B, D", "T, B, D")
+    assert b.shape.as_list() == [1, 2, 4]
+    assert (b + tf.zeros([3, 2, 4])).shape.as_list() == [3, 2, 4]
+
+
+def test_broadcast_validates_source():
+    sg = ShapeGuard(dims={"D": 5, "T": 3})
+    with pytest.raises(ShapeError):
+        sg.broadcast(np.ones([2, 4]), "B, D", "B, T, D")
+    with pytest.raises(ValueError):
+        sg.broadcast(np.ones([5, 2]), "D, B", "B, T, D")
@@ -0,0 +1,57 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from shapeguard import ShapeGuard
+
+
+def test_check_returns_inferred_dims():
+    sg = ShapeGuard()
+    result = sg.check(np.ones([1, 2, 3]), "A, B, C")
+    assert result.ok
+    assert result
+    assert result.dims == {"A": 1, "B": 2, "C": 3}
+    assert result.index is None
+    assert result.message == ""
+
+
+def test_check_does_not_update_dims():
+    sg = ShapeGuard()
+    sg.check(np.ones([1, 2, 3]), "A, B, C")
+    assert sg.dims == {}
+
+
+def test_check_message_uses_dims_at_check_time():
+    sg = ShapeGuard()
+    result = sg.check([3, 4], "A, A")
+    sg.guard([9], "A")
+    assert "Expected shape: ['A', 'A']" in result.message
+
+
+def test_check_reports_first_failing_index():
+    sg = ShapeGuard(dims={"C": 4})
+    result = sg.check(np.ones([1, 2, 3, 5]), "A, B, ..., C")
+    assert not result
+    assert result.dims == {}
+    assert result.index == 3
+    assert "Shape Mismatch" in result.message
+
+
+def test_check_wrong_rank():
+    sg = ShapeGuard()
+    result = sg.check([1, 2, 3], "A, B")
+    assert not result
+    assert result.index is None
+    assert "wrong rank" in result.message
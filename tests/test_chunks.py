@@ -0,0 +1,46 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from shapeguard import ShapeError
+from shapeguard import ShapeGuard
+from shapeguard.headers import array_shapes
+
+
+def test_hdf5(tmp_path):
+    h5py = pytest.importorskip("h5py")
+    path = tmp_path / "data.h5"
+    with h5py.File(path, "w") as f:
+        images = f.create_dataset("train/images", (10, 8, 8, 3), chunks=(1, 8, 8, 3))
+        labels = f.create_dataset("train/labels", (10,))
+        sg = ShapeGuard()
+        sg.guard(images, "N, H, W, C")
+        sg.guard_chunks(images, "1, H, W, C", aligned=True)
+        sg.guard_chunks(labels, "N")  # contiguous: a single chunk
+        with pytest.raises(ShapeError):
+            sg.guard_chunks(images, "N, H, W, C")
+    assert array_shapes(path) == {"train/images": [10, 8, 8, 3], "train/labels": [10]}
+
+
+def test_zarr_alignment():
+    zarr = pytest.importorskip("zarr")
+    array = zarr.zeros((10, 64), chunks=(4, 64))
+    sg = ShapeGuard()
+    sg.guard(array, "N, D")
+    assert sg.dims == {"N": 10, "D": 64}
+    sg.guard_chunks(array, "_n, D")
+    with pytest.raises(ShapeError):
+        sg.guard_chunks(array, "_n, D", aligned=True)  # 10 % 4 != 0
+    assert "_n" not in sg.dims
@@ -0,0 +1,64 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from shapeguard import dispatch
+from shapeguard import ShapeError
+from shapeguard.exception import AmbiguousTemplateError
+
+
+def test_dispatch_selects_by_rank():
+    d = dispatch({"B, T, D": "seq", "B, D": "flat", "B, ..., H, W, C": "img"})
+    assert d([4, 5, 6]) == ("seq", {"B": 4, "T": 5, "D": 6})
+    assert d([4, 5]) == ("flat", {"B": 4, "D": 5})
+    assert d([2, 3, 4, 5, 6]) == ("img", {"B": 2, "H": 4, "W": 5, "C": 6})
+
+
+def test_dispatch_selects_by_constants():
+    with pytest.warns(UserWarning):  # "2*K" is assumed to match any size
+        d = dispatch({"B, 1": "one", "B, 3": "three", "B, 2*K": "even"})
+    assert d.overlaps == [("B, 1", "B, 2*K"), ("B, 3", "B, 2*K")]
+    assert d([7, 1])[0] == "one"
+    assert d([7, 3])[0] == "three"
+    assert d([7, 4]) == ("even", {"B": 7, "K": 2})
+    assert d.lookup([7, 5]) is None
+    with pytest.raises(ShapeError):
+        d([7, 5])
+
+
+def test_dispatch_first_match_wins():
+    with pytest.warns(UserWarning):
+        d = dispatch({"N, N": "square", "N, M": "rect"})
+    assert d.overlaps == [("N, N", "N, M")]
+    assert d([3, 3])[0] == "square"
+    assert d([3, 4])[0] == "rect"
+
+
+def test_dispatch_overlaps_respect_equal_names():
+    d = dispatch({"N, N": "square", "3, 4": "rect", "N, 4, N": "a", "3, M, 5": "b"})
+    assert d.overlaps == []
+    assert d([3, 3])[0] == "square"
+    assert d([3, 4])[0] == "rect"
+
+
+def test_dispatch_uses_known_dims():
+    d = dispatch({"B, D": "flat"}, warn_overlaps=False)
+    assert d([4, 5], dims={"D": 5})[0] == "flat"
+    assert d.lookup([4, 5], dims={"D": 6}) is None
+
+
+def test_dispatch_raises_on_equivalent_templates():
+    with pytest.raises(AmbiguousTemplateError):
+        dispatch({"B, T": 1, "N, M": 2})
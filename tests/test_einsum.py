@@ -0,0 +1,59 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from shapeguard import ShapeError
+from shapeguard import ShapeGuard
+from shapeguard.plans import PATH_CACHE_SIZE
+from shapeguard.plans import einsum_plan
+
+
+def test_einsum_translates_pattern():
+    plan = einsum_plan("Batch, Time, D; D, K -> Batch, Time, K")
+    assert plan.subscripts == "abc,cd->abd"
+    assert einsum_plan("..., D; D, K -> ..., K").subscripts == "...a,ab->...b"
+
+
+def test_einsum_numpy_caches_path():
+    sg = ShapeGuard()
+    x = np.random.rand(2, 3, 4)
+    w = np.random.rand(4, 5)
+    y = sg.einsum("B, T, D; D, K -> B, T, K", x, w)
+    np.testing.assert_allclose(y, x @ w)
+    assert sg.dims == {"B": 2, "T": 3, "D": 4, "K": 5}
+    assert ((2, 3, 4), (4, 5)) in einsum_plan("B, T, D; D, K -> B, T, K").paths
+
+
+def test_einsum_path_cache_is_bounded():
+    plan = einsum_plan("T, D; D, K -> T, K")
+    w = np.ones([4, 5])
+    for t in range(1, PATH_CACHE_SIZE + 10):
+        plan.apply(np.ones([t, 4]), w)
+    assert len(plan.paths) == PATH_CACHE_SIZE
+    assert ((PATH_CACHE_SIZE + 9, 4), (4, 5)) in plan.paths
+
+
+def test_einsum_guards_operands():
+    sg = ShapeGuard()
+    with pytest.raises(ShapeError):
+        sg.einsum("B, T, D; D, K -> B, T, K", np.ones([2, 3, 4]), np.ones([5, 5]))
+
+
+def test_einsum_tensorflow():
+    sg = ShapeGuard()
+    y = sg.einsum("B, T, D; D, K -> B, K", tf.ones([2, 3, 4]), tf.ones([4, 5]))
+    assert y.shape.as_list() == [2, 5]
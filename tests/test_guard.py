@@ -17,6 +17,7 @@ import tensorflow as tf
 
 from shapeguard import ShapeError
 from shapeguard import ShapeGuard
+from shapeguard import parser
 
 
 def test_guard_raises():
@@ -103,3 +104,93 @@ def test_guard_ellipsis_infer_dims():
     a = tf.ones([1, 2, 3, 4, 5])
     sg.guard(a, "A, B, ..., C")
     assert sg.dims == {"A": 1, "B": 2, "C": 5}
+
+
+def test_guard_resolves_pending_constraints():
+    sg = ShapeGuard()
+    sg.guard([6, 3], "B*T, H")
+    assert sg.dims == {"H": 3}
+    assert len(sg.pending) == 1
+    sg.guard([2], "B")
+    assert sg.dims == {"B": 2, "H": 3, "T": 3}
+    assert len(sg.pending) == 0
+
+
+def test_guard_raises_on_violated_pending_constraint():
+    sg = ShapeGuard()
+    sg.guard([6, 3], "B*T, H")
+    with pytest.raises(ShapeError):
+        sg.guard([4], "B")
+
+
+def test_repeated_guards_store_a_constraint_once():
+    sg = ShapeGuard()
+    for _ in range(1000):
+        sg.guard([6, 3], "B*T, H")
+    assert len(sg.pending) == 1
+    sg.guard([2], "T")
+    assert len(sg.pending) == 0
+    assert sg.dims == {"H": 3, "T": 2, "B": 3}
+
+
+def test_violated_pending_constraint_leaves_guard_unchanged():
+    sg = ShapeGuard()
+    sg.guard([6, 3], "B*T, H")
+    for _ in range(2):
+        with pytest.raises(ShapeError):
+            sg.guard([4], "B")
+        assert sg.dims == {"H": 3}
+        assert len(sg.pending) == 1
+    with pytest.raises(ShapeError):
+        sg.B = 5
+    assert sg.dims == {"H": 3}
+    sg.guard([2], "B")
+    assert sg.dims == {"H": 3, "T": 3, "B": 2}
+    assert len(sg.pending) == 0
+
+
+def test_pending_constraints_cascade():
+    sg = ShapeGuard()
+    sg.guard([7, 5], "A+B, B+C")
+    sg.A = 3
+    assert sg.dims == {"A": 3, "B": 4, "C": 1}
+    assert len(sg.pending) == 0
+
+
+def test_guard_named_ellipsis_binds_dims():
+    sg = ShapeGuard()
+    sg.guard([2, 3, 4, 5], "*batch, D")
+    assert sg.dims == {"batch": (2, 3, 4), "D": 5}
+    assert sg.evaluate("*batch, D") == [2, 3, 4, 5]
+    assert sg.evaluate("prod(batch), D") == [24, 5]
+
+
+def test_guard_named_ellipsis_raises():
+    sg = ShapeGuard()
+    sg.guard([2, 3, 4, 5], "*batch, D")
+    with pytest.raises(ShapeError):
+        sg.guard([2, 4, 5], "*batch, D")
+    with pytest.raises(ShapeError):
+        sg.guard([2, 3, 3, 5], "*batch, D")
+
+
+def test_guard_prod_of_named_ellipsis():
+    sg = ShapeGuard()
+    sg.guard([2, 3, 4, 5], "*batch, D")
+    sg.guard([24, 5], "prod(batch), D")
+    with pytest.raises(ShapeError):
+        sg.guard([23, 5], "prod(batch), D")
+
+
+def test_prod_is_not_reserved():
+    sg = ShapeGuard()
+    sg.guard([2, 3], "prod, D")
+    assert sg.dims == {"prod": 2, "D": 3}
+    assert sg.evaluate("prod*D") == [6]
+
+
+def test_parse_cache_is_bounded():
+    for i in range(parser._CACHE_SIZE + 10):
+        parser.parse("B, {}".format(i))
+    assert len(parser._cache) == parser._CACHE_SIZE
+    assert parser.parse("B, 3") is parser.parse("B, 3")
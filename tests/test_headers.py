@@ -0,0 +1,112 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+import wave
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from shapeguard import ShapeGuard
+from shapeguard import get_shape
+from shapeguard.audit import audit, parse_rule
+from shapeguard.headers import npz_headers
+
+
+def test_guard_npy_path(tmp_path):
+    path = tmp_path / "x.npy"
+    np.save(path, np.zeros([4, 8, 8, 3], dtype=np.uint8))
+    assert get_shape(path) == [4, 8, 8, 3]
+    sg = ShapeGuard()
+    sg.guard(str(path), "B, H, W, C")
+    assert sg.dims == {"B": 4, "H": 8, "W": 8, "C": 3}
+
+
+def test_memmap(tmp_path):
+    path = tmp_path / "x.npy"
+    np.save(path, np.zeros([5, 2]))
+    assert get_shape(np.load(path, mmap_mode="r")) == [5, 2]
+
+
+@pytest.mark.parametrize("save", [np.savez, np.savez_compressed])
+def test_npz(tmp_path, save):
+    path = tmp_path / "x.npz"
+    save(path, images=np.zeros([2, 3, 4], dtype=np.float32), labels=np.zeros([2]))
+    headers = npz_headers(path)
+    assert headers["images"].shape == [2, 3, 4]
+    assert headers["images"].dtype == np.float32
+    assert headers["labels"].shape == [2]
+    with pytest.raises(ValueError):
+        get_shape(path)  # ambiguous
+    save(path, np.zeros([7, 1]))
+    assert get_shape(path) == [7, 1]
+
+
+@pytest.mark.parametrize("channels", [1, 3, 4])
+def test_png(tmp_path, channels):
+    path = tmp_path / "x.png"
+    path.write_bytes(tf.io.encode_png(tf.zeros([5, 7, channels], tf.uint8)).numpy())
+    assert get_shape(path) == [5, 7, channels]
+
+
+def test_corrupt_png_header(tmp_path):
+    path = tmp_path / "x.png"
+    data = bytearray(tf.io.encode_png(tf.zeros([5, 7, 3], tf.uint8)).numpy())
+    data[25] = 5  # color type
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="color type 5"):
+        get_shape(path)
+
+
+@pytest.mark.parametrize("channels", [1, 3])
+def test_jpeg(tmp_path, channels):
+    path = tmp_path / "x.jpg"
+    image = tf.zeros([17, 9, channels], tf.uint8)
+    path.write_bytes(tf.io.encode_jpeg(image, xmp_metadata="meta").numpy())
+    assert get_shape(path) == [17, 9, channels]
+
+
+def test_gif(tmp_path):
+    path = tmp_path / "x.gif"
+    path.write_bytes(b"GIF89a" + struct.pack("<HH", 12, 4) + b"\x00" * 3)
+    assert get_shape(path) == [4, 12, 3]
+
+
+@pytest.mark.parametrize(
+    "fmt, message",
+    [
+        (struct.pack("<HHIIH", 1, 2, 16000, 0, 0), "block align"),
+        (struct.pack("<HHI", 1, 2, 16000), "too short"),
+    ],
+)
+def test_corrupt_wav_header(tmp_path, fmt, message):
+    path = tmp_path / "x.wav"
+    chunks = struct.pack("<4sI", b"fmt ", len(fmt)) + fmt
+    chunks += struct.pack("<4sI", b"data", 8) + b"\x00" * 8
+    path.write_bytes(b"RIFF" + struct.pack("<I", len(chunks) + 4) + b"WAVE" + chunks)
+    with pytest.raises(ValueError, match=message):
+        get_shape(path)
+
+
+def test_wav_and_audit(tmp_path):
+    for name, channels in [("mono.wav", 1), ("stereo.wav", 2)]:
+        with wave.open(str(tmp_path / name), "wb") as w:
+            w.setnchannels(channels)
+            w.setsampwidth(2)
+            w.setframerate(16000)
+            w.writeframes(b"\x00" * 2 * channels * 100)
+    assert get_shape(tmp_path / "stereo.wav") == [100, 2]
+    report = audit([str(tmp_path)], [parse_rule("*.wav=_T, 2")], threads=True)
+    assert [v["file"] for v in report["violations"]] == [str(tmp_path / "mono.wav")]
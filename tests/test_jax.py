@@ -0,0 +1,61 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from shapeguard import ShapeError
+from shapeguard import ShapeGuard
+from shapeguard import get_shape
+from shapeguard.exception import UnderspecifiedShapeError
+
+jax = pytest.importorskip("jax")
+jnp = jax.numpy
+
+
+def test_get_shape_jax():
+    assert get_shape(jnp.ones([2, 3])) == [2, 3]
+    assert get_shape(jax.ShapeDtypeStruct((4, 5), jnp.float32)) == [4, 5]
+
+
+def test_guard_under_jit_adds_no_ops():
+    sg = ShapeGuard(dims={"D": 3})
+
+    def f(x):
+        return jnp.tanh(x).sum(axis=-1)
+
+    def guarded(x):
+        sg.guard(x, "B, D")
+        return sg.guard(f(x), "B")
+
+    assert str(jax.make_jaxpr(guarded)(jnp.ones([2, 3]))) == str(
+        jax.make_jaxpr(f)(jnp.ones([2, 3]))
+    )
+    with pytest.raises(ShapeError):
+        jax.jit(guarded)(jnp.ones([2, 4]))
+
+
+def test_eval_shape_with_templates():
+    sg = ShapeGuard(dims={"B": 8, "T": 5, "D": 3, "K": 4})
+
+    def model(x, w):
+        sg.guard(x, "B, T, D")
+        y = sg.einsum("B, T, D; D, K -> B, T, K", x, w)
+        return sg.rearrange(y, "B, T, K -> B, K", reduction="max")
+
+    out = jax.eval_shape(
+        model, sg.shape_dtype_struct("B, T, D"), sg.shape_dtype_struct("D, K")
+    )
+    assert sg.check(out, "B, K")
+    with pytest.raises(UnderspecifiedShapeError):
+        sg.shape_dtype_struct("B, L?")
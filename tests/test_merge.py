@@ -0,0 +1,75 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pickle
+
+import pytest
+
+from shapeguard import ShapeError
+from shapeguard import ShapeGuard
+from shapeguard.exception import DimConflictError
+
+
+def test_merge_all_combines_dims():
+    a = ShapeGuard()
+    a.guard([2, 3], "B, H")
+    b = ShapeGuard()
+    b.guard([3, 4], "H, W")
+    merged = ShapeGuard.merge_all([a, b])
+    assert merged.dims == {"B": 2, "H": 3, "W": 4}
+
+
+def test_merge_raises_on_conflict():
+    a = ShapeGuard(dims={"H": 3})
+    b = ShapeGuard(dims={"H": 5})
+    with pytest.raises(DimConflictError) as excinfo:
+        a.merge(b)
+    assert excinfo.value.conflicts == {"H": [3, 5]}
+    assert a.dims == {"H": 3}
+
+
+def test_merge_non_strict_reports_conflicts():
+    a = ShapeGuard(dims={"H": 3})
+    b = ShapeGuard(dims={"H": 5, "W": 1})
+    assert a.merge(b, strict=False) == {"H": [3, 5]}
+    assert a.dims == {"H": 3, "W": 1}
+
+
+def test_merge_all_non_strict_reports_conflicts():
+    guards = [ShapeGuard(dims={"H": h, "C": 3}) for h in [3, 5, 3, 7]]
+    with pytest.raises(DimConflictError):
+        ShapeGuard.merge_all(guards)
+    merged = ShapeGuard.merge_all(guards, strict=False)
+    assert merged.dims == {"H": 3, "C": 3}
+    assert merged.conflicts == {"H": [3, 5, 7]}
+
+
+def test_merge_resolves_pending_constraints():
+    a = ShapeGuard()
+    a.guard([6], "B*T")
+    b = ShapeGuard(dims={"B": 2})
+    b.merge(pickle.loads(pickle.dumps(a)))
+    assert b.dims == {"B": 2, "T": 3}
+
+
+def test_failed_merge_leaves_receiver_unchanged():
+    a = ShapeGuard()
+    a.guard([6], "B*T")
+    b = ShapeGuard(dims={"B": 4, "W": 1})
+    with pytest.raises(ShapeError):
+        a.merge(b, strict=False)
+    assert a.dims == {}
+    assert len(a.pending) == 1
+    a.merge(ShapeGuard(dims={"B": 2}))
+    assert a.dims == {"B": 2, "T": 3}
@@ -0,0 +1,66 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from shapeguard import ShapeError
+from shapeguard import ShapeGuard
+from shapeguard import pad_to_bucket
+from shapeguard.padding import bucket_by_template
+
+
+def test_pad_to_bucket_numpy():
+    x = np.random.rand(2, 50, 5)
+    padded, mask = pad_to_bucket(
+        x, "B, T, D", {}, buckets={"T": [64, 128]}, multiple_of={"D": 8}, value=-1
+    )
+    assert padded.shape == (2, 64, 8)
+    assert mask.shape == (1, 64, 8)
+    assert mask.sum() == 50 * 5
+    np.testing.assert_array_equal(padded[:, :50, :5], x)
+    assert np.all(padded[~np.broadcast_to(mask, padded.shape)] == -1)
+
+
+def test_pad_to_bucket_tensorflow():
+    padded, mask = pad_to_bucket(tf.ones([2, 70, 8]), "B, T, D", {}, {"T": [64, 128]})
+    assert padded.shape.as_list() == [2, 128, 8]
+    assert mask.shape.as_list() == [1, 128, 1]
+    assert float(tf.reduce_sum(padded)) == 2 * 70 * 8
+
+
+def test_pad_to_bucket_guard_does_not_store_bucketed_dims():
+    sg = ShapeGuard()
+    for t in [3, 6]:
+        padded, _ = sg.pad_to_bucket(np.ones([2, t]), "B, T", {"T": [4, 8]})
+        assert padded.shape == (2, 4 if t < 4 else 8)
+    assert sg.dims == {"B": 2}
+    with pytest.raises(ShapeError):
+        sg.pad_to_bucket(np.ones([2, 9]), "B, T", {"T": [4, 8]})
+
+
+def test_bucket_by_template():
+    lengths = [3, 10, 5, 12, 2, 9]
+    dataset = tf.data.Dataset.from_generator(
+        lambda: ((np.ones([t, 5], np.float32), np.arange(t)) for t in lengths),
+        output_signature=(tf.TensorSpec([None, 5]), tf.TensorSpec([None], tf.int64)),
+    )
+    dataset = dataset.apply(
+        bucket_by_template(
+            ("T, D", "T"), {"T": [4, 16]}, 2, dims={"D": 5}, multiple_of={"D": 8}
+        )
+    )
+    shapes = sorted(tuple(x.shape.as_list()) for x, _ in dataset)
+    assert shapes == [(2, 4, 8), (2, 16, 8), (2, 16, 8)]
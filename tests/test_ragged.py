@@ -0,0 +1,64 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import tensorflow as tf
+
+from shapeguard import ShapeError
+from shapeguard import ShapeGuard
+from shapeguard import get_shape
+from shapeguard import parser
+from shapeguard.dim_specs import NamedDim, RaggedDim
+
+
+def test_parse_ragged():
+    spec = parser.parse("B, ragged(T), D")
+    assert isinstance(spec.entries[1], RaggedDim)
+    assert repr(spec.entries[1]) == "ragged(T)"
+    # inside of expressions a ragged dim is just its name
+    assert type(parser.parse("ragged(T)*2").entries[0].left) is NamedDim
+    # parentheses only group, and "ragged" is not reserved
+    assert type(parser.parse("(T)").entries[0]) is NamedDim
+    assert type(parser.parse("ragged, T").entries[0]) is NamedDim
+
+
+def test_parse_unknown_function():
+    with pytest.raises(ValueError):
+        parser.parse("B, jagged(T)")
+
+
+def test_guard_ragged_tensor():
+    rt = tf.RaggedTensor.from_row_lengths(tf.ones([5, 4]), [2, 3])
+    assert get_shape(rt) == [2, None, 4]
+    sg = ShapeGuard()
+    assert sg.guard(rt, "B, ragged(T), D") is rt
+    assert sg.dims == {"B": 2, "D": 4}
+    with pytest.raises(ShapeError):
+        sg.guard(rt, "B, T, D")
+    with pytest.raises(ShapeError):
+        sg.guard(rt, "B, ragged(T), 3")
+
+
+def test_ragged_dim_binds_uniform_size():
+    sg = ShapeGuard()
+    sg.guard(tf.ones([2, 7]), "B, ragged(T)")
+    assert sg.dims == {"B": 2, "T": 7}
+
+
+def test_guard_sparse_tensor():
+    sp = tf.sparse.SparseTensor(indices=[[0, 1]], values=[1.0], dense_shape=[3, 5])
+    assert get_shape(sp) == [3, 5]
+    sg = ShapeGuard()
+    sg.guard(sp, "N, V")
+    assert sg.dims == {"N": 3, "V": 5}
@@ -0,0 +1,77 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from shapeguard import ShapeError
+from shapeguard import ShapeGuard
+from shapeguard.exception import UnderspecifiedShapeError
+from shapeguard.plans import rearrange_plan
+
+
+def test_rearrange_transpose_and_merge():
+    sg = ShapeGuard()
+    x = np.arange(2 * 3 * 4 * 5).reshape([2, 3, 4, 5])
+    y = sg.rearrange(x, "B, H, W, C -> B, C, H*W")
+    np.testing.assert_array_equal(y, x.transpose([0, 3, 1, 2]).reshape([2, 5, 12]))
+    assert sg.dims == {"B": 2, "H": 3, "W": 4, "C": 5}
+    np.testing.assert_array_equal(sg.rearrange(y, "B, C, H*W -> B, H, W, C"), x)
+
+
+def test_rearrange_reduce():
+    sg = ShapeGuard()
+    x = np.arange(2 * 3 * 4).reshape([2, 3, 4])
+    np.testing.assert_array_equal(
+        sg.rearrange(x, "B, T, D -> B, D", reduction="mean"), x.mean(axis=1)
+    )
+    with pytest.raises(ValueError):
+        sg.rearrange(x, "B, T, D -> B, D")
+
+
+def test_rearrange_skips_noop_steps():
+    plan = rearrange_plan("B, H, W, C -> B*H, W, C")
+    assert not plan.split and plan.perm is None and not plan.reduce_axes
+    x = np.ones([2, 3, 4, 5])
+    assert np.shares_memory(ShapeGuard().rearrange(x, "B, H, W, C -> B*H, W, C"), x)
+
+
+def test_rearrange_tensorflow():
+    sg = ShapeGuard(dims={"C": 5})
+    y = sg.rearrange(tf.ones([2, 3, 4, 5]), "B, H, W, C -> W, 1, B*H*C")
+    assert y.shape.as_list() == [4, 1, 30]
+    with pytest.raises(ShapeError):
+        sg.rearrange(tf.ones([2, 3, 4, 6]), "B, H, W, C -> C, B, H, W")
+
+
+def test_rearrange_private_dims():
+    x = np.arange(2 * 3 * 4).reshape([2, 3, 4])
+    sg = ShapeGuard()
+    y = sg.rearrange(x, "_B, T, D -> T, _B*D")
+    np.testing.assert_array_equal(y, x.transpose([1, 0, 2]).reshape([3, 8]))
+    assert sg.dims == {"T": 3, "D": 4}
+
+
+def test_rearrange_split_needs_known_dims():
+    x = np.ones([6, 4])
+    with pytest.raises(UnderspecifiedShapeError):
+        ShapeGuard().rearrange(x, "B*T, D -> B, T, D")
+    y = ShapeGuard(dims={"B": 2}).rearrange(x, "B*T, D -> B, T, D")
+    assert y.shape == (2, 3, 4)
+
+
+def test_rearrange_rejects_output_constants():
+    with pytest.raises(ValueError):
+        rearrange_plan("B, D -> B, 2, D")
@@ -0,0 +1,52 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from shapeguard import ShapeGuard
+from shapeguard.exception import CopyRequiredError
+
+
+def test_reshape_numpy_returns_view():
+    sg = ShapeGuard(dims={"A": 4, "B": 6})
+    a = np.ones([4, 6])
+    b = sg.reshape(a, "A*B")
+    assert isinstance(b, np.ndarray)
+    assert b.shape == (24,)
+    assert np.shares_memory(a, b)
+
+
+def test_reshape_returns_input_if_shape_matches():
+    sg = ShapeGuard(dims={"A": 4, "B": 6})
+    a = np.ones([4, 6])
+    assert sg.reshape(a, "A, B") is a
+    t = tf.ones([4, 6])
+    assert sg.reshape(t, "A, B") is t
+
+
+def test_reshape_reports_required_copy():
+    sg = ShapeGuard(dims={"A": 4, "B": 6})
+    a = np.ones([4, 6]).T
+    with pytest.raises(CopyRequiredError):
+        sg.reshape(a, "A*B", allow_copy=False)
+    assert sg.reshape(a, "A*B").shape == (24,)
+
+
+def test_reshape_tensorflow():
+    sg = ShapeGuard(dims={"A": 4, "B": 6})
+    b = sg.reshape(tf.ones([4, 6]), "B, A")
+    assert isinstance(b, tf.Tensor)
+    assert b.shape.as_list() == [6, 4]
@@ -0,0 +1,73 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from shapeguard import ShapeError
+from shapeguard import ShapeGuard
+from shapeguard.exception import RowConstraintError
+from shapeguard.rows import check_rows, guard_rows, row_lengths
+
+
+def test_check_rows_numpy():
+    lengths = np.diff([0, 3, 10, 12, 20])  # from row_splits
+    result = check_rows("T <= 5", {"T": lengths})
+    assert not result
+    assert list(result.rows) == [1, 3]
+    assert "T <= 5" in result.message
+    assert check_rows(["T <= 8", "T > 0"], {"T": lengths})
+
+
+def test_check_rows_between_tensors_and_known_dims():
+    tokens = tf.RaggedTensor.from_row_lengths(tf.ones([9]), [2, 3, 4])
+    labels = tf.RaggedTensor.from_row_lengths(tf.ones([10]), [2, 4, 4])
+    row_dims = {
+        **row_lengths(tokens, "B, ragged(T_x)"),
+        **row_lengths(labels, "B, ragged(T_y)"),
+    }
+    result = check_rows(["T_x == T_y", "T_x <= max_len"], row_dims, {"max_len": 3})
+    assert list(result.rows) == [1, 2]
+    assert list(result.failures["T_x == T_y"]) == [1]
+    assert list(result.failures["T_x <= max_len"]) == [2]
+
+
+def test_guard_rows_raises_with_rows():
+    sg = ShapeGuard(dims={"K": 2})
+    sg.guard_rows("T_a == K*T_b", {"T_a": [4, 6, 4], "T_b": [2, 3, 2]})
+    with pytest.raises(RowConstraintError) as excinfo:
+        sg.guard_rows("T_a == K*T_b", {"T_a": [4, 5, 2], "T_b": [2, 3, 2]})
+    assert list(excinfo.value.rows) == [1, 2]
+
+
+def test_guard_rows_in_tf_function():
+    @tf.function
+    def f(tokens):
+        guard_rows("T <= 3", row_lengths(tokens, "B, ragged(T)"))
+        result = check_rows("T <= 3", row_lengths(tokens, "B, ragged(T)"))
+        return result.ok, result.rows
+
+    ok, rows = f(tf.RaggedTensor.from_row_lengths(tf.ones([5]), [2, 3]))
+    assert ok.numpy() and list(rows.numpy()) == []
+    with pytest.raises(tf.errors.InvalidArgumentError, match="T <= 3"):
+        f(tf.RaggedTensor.from_row_lengths(tf.ones([6]), [2, 4]))
+
+
+def test_row_lengths_dense_and_errors():
+    assert list(row_lengths(np.ones([3, 4]), "B, ragged(T)")["T"]) == [4, 4, 4]
+    with pytest.raises(ValueError):
+        row_lengths(np.ones([3, 4]), "B, T")
+    with pytest.raises(ShapeError):
+        check_rows("T_x == T_y", {"T_x": [1, 2], "T_y": [1, 2, 3]})
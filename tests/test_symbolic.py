@@ -0,0 +1,73 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import tensorflow as tf
+
+from shapeguard import ShapeGuard
+from shapeguard.exception import UnderspecifiedShapeError
+
+
+def test_reshape_dynamic_dims_in_graph():
+    sg = ShapeGuard(dims={"D": 4}, symbolic=True)
+
+    @tf.function(input_signature=[tf.TensorSpec([None, None, 4])])
+    def f(x):
+        sg.guard(x, "B?, T?, D")
+        return sg.reshape(sg.reshape(x, "B*T, D"), "B, T*D")
+
+    graph = f.get_concrete_function().graph
+    assert [op.type for op in graph.get_operations()].count("Shape") == 1
+    assert f(tf.ones([2, 3, 4])).shape == [2, 12]
+    assert sg.dims == {"D": 4}
+    assert sorted(sg.symbolic_dims) == ["B", "T"]
+
+
+def test_static_dims_take_precedence():
+    sg = ShapeGuard(symbolic=True)
+
+    @tf.function(input_signature=[tf.TensorSpec([None, 3])])
+    def f(x):
+        sg.guard(x, "B?, T")
+        return sg.reshape(x, "B*T")
+
+    assert f.get_concrete_function().structured_outputs.shape.as_list() == [None]
+    assert sg.dims == {"T": 3}
+    assert list(sg.symbolic_dims) == ["B"]
+
+
+def test_without_symbolic_dynamic_reshape_fails():
+    sg = ShapeGuard()
+
+    @tf.function(input_signature=[tf.TensorSpec([None, 3])])
+    def f(x):
+        sg.guard(x, "B?, T")
+        return sg.reshape(x, "B*T")
+
+    with pytest.raises(UnderspecifiedShapeError):
+        f.get_concrete_function()
+
+
+def test_refine_shape():
+    sg = ShapeGuard(dims={"H": 4, "W": 8})
+
+    @tf.function(input_signature=[tf.TensorSpec([None, None, None])])
+    def f(x):
+        x = sg.guard(x, "B?, H?, W*2", refine_shape=True)
+        assert x.shape.as_list() == [None, 4, 16]
+        unrefined = sg.guard(tf.identity(x), "B?, H?, W*2")
+        assert unrefined.shape.as_list() == [None, 4, 16]  # propagated
+        return tf.reduce_sum(x, axis=[1, 2])
+
+    assert f(tf.ones([3, 4, 16])).shape == [3]
@@ -0,0 +1,47 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tensorflow as tf
+
+from shapeguard import ShapeGuard
+
+
+def test_tensor_spec_static_and_dynamic_dims():
+    sg = ShapeGuard(dims={"B": 8, "D": 3})
+    spec = sg.tensor_spec("B?, T, D*2, 5", dtype=tf.int32, name="x")
+    assert spec.shape.as_list() == [None, None, 6, 5]
+    assert spec.dtype == tf.int32
+    assert spec.name == "x"
+
+
+def test_tensor_spec_ellipsis():
+    sg = ShapeGuard(dims={"D": 3, "batch": (2, 4)})
+    assert sg.tensor_spec("..., D").shape.rank is None
+    assert sg.tensor_spec("*other, D").shape.rank is None
+    assert sg.tensor_spec("*batch, D").shape.as_list() == [2, 4, 3]
+
+
+def test_function_traces_once():
+    sg = ShapeGuard(dims={"D": 3})
+    traces = []
+
+    @sg.function("B?, T?, D", ("B?", tf.int32))
+    def f(x, lengths):
+        traces.append(x.shape)
+        return tf.reduce_sum(x, axis=[1, 2]) + tf.cast(lengths, tf.float32)
+
+    for b, t in [(1, 2), (3, 5), (8, 1)]:
+        assert f(tf.ones([b, t, 3]), tf.ones([b], tf.int32)).shape == [b]
+    assert len(traces) == 1
+    assert traces[0].as_list() == [None, None, 3]
@@ -0,0 +1,93 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import tensorflow as tf
+
+from shapeguard import tfrecord
+
+
+def make_example(tokens, labels, name=b"x"):
+    feature = {
+        "tokens": tf.train.Feature(int64_list=tf.train.Int64List(value=tokens)),
+        "labels": tf.train.Feature(float_list=tf.train.FloatList(value=labels)),
+        "name": tf.train.Feature(bytes_list=tf.train.BytesList(value=[name])),
+    }
+    example = tf.train.Example(features=tf.train.Features(feature=feature))
+    return example.SerializeToString()
+
+
+def write_shard(path, records, compression=None):
+    options = tf.io.TFRecordOptions(compression_type=compression)
+    with tf.io.TFRecordWriter(str(path), options) as writer:
+        for record in records:
+            writer.write(record)
+
+
+def test_feature_lengths():
+    record = make_example([1, 300, -5, 2**40], [0.5] * 7)
+    assert tfrecord.feature_lengths(record) == {"tokens": 4, "labels": 7, "name": 1}
+
+
+@pytest.mark.parametrize("compression", [None, "GZIP"])
+def test_validate_shard(tmp_path, compression):
+    records = [
+        make_example([1, 2, 3], [0.0] * 3),
+        make_example([1, 2], [0.0] * 3),
+        make_example(list(range(600)), [0.0] * 600),
+    ]
+    path = tmp_path / "data.tfrecord"
+    write_shard(path, records, compression)
+    offsets = [offset for offset, _ in tfrecord.read_records(str(path), compression)]
+    assert offsets == [0, len(records[0]) + 16, len(records[0]) + len(records[1]) + 32]
+
+    templates = {"tokens": "T<=max_len", "labels": "T", "name": "1"}
+    violations = tfrecord.validate_shard(
+        str(path), templates, {"max_len": 512}, compression
+    )
+    assert [(v.index, v.offset, v.feature) for v in violations] == [
+        (1, offsets[1], "labels"),
+        (2, offsets[2], "tokens"),
+    ]
+
+
+def test_missing_feature():
+    record = make_example([1], [1.0])
+    assert tfrecord.check_lengths(
+        tfrecord.feature_lengths(record), {"weights": "T"}, {}
+    ) == ("weights", 'Missing feature "weights"')
+
+
+def test_corrupt_record(tmp_path):
+    with pytest.raises(ValueError):
+        tfrecord.feature_lengths(b"\x0a\xff")
+    with pytest.raises(ValueError):
+        tfrecord.feature_lengths(make_example([1], [1.0])[:-3])
+    path = tmp_path / "data.tfrecord"
+    write_shard(
+        path, [make_example([1], [1.0]), b"\x0a\x05\x0a", make_example([1, 2], [1.0])]
+    )
+    violations = tfrecord.validate_shard(str(path), {"tokens": "T", "labels": "T"})
+    assert [(v.index, v.feature) for v in violations] == [(1, None), (2, "labels")]
+    assert violations[0].offset == len(make_example([1], [1.0])) + 16
+
+
+def test_validate_shards_in_parallel(tmp_path):
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / "shard-{}.tfrecord".format(i)))
+        write_shard(paths[-1], [make_example([1] * i, [0.0]), make_example([1], [0.0])])
+    templates = {"tokens": "T", "labels": "T"}
+    violations = tfrecord.validate(paths, templates, workers=2, threads=True)
+    assert [(v.path, v.index) for v in violations] == [(paths[0], 0), (paths[2], 0)]
@@ -0,0 +1,61 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from shapeguard import ShapeError
+from shapeguard import ShapeGuard
+from shapeguard import get_shape
+from shapeguard.exception import CopyRequiredError
+
+torch = pytest.importorskip("torch")
+
+
+def test_get_shape_torch():
+    assert get_shape(torch.ones(2, 3)) == [2, 3]
+    assert get_shape(torch.Size([4, 5])) == [4, 5]
+
+
+def test_guard_torch():
+    sg = ShapeGuard()
+    x = torch.ones(2, 3, 4)
+    assert sg.guard(x, "B, T, D") is x
+    assert sg.dims == {"B": 2, "T": 3, "D": 4}
+    with pytest.raises(ShapeError):
+        sg.guard(torch.ones(2, 5), "B, D")
+
+
+def test_reshape_torch_view():
+    sg = ShapeGuard()
+    x = sg.guard(torch.ones(2, 3, 4), "B, T, D")
+    flat = sg.reshape(x, "B*T, D")
+    assert flat.shape == (6, 4)
+    assert flat.data_ptr() == x.data_ptr()
+    with pytest.raises(CopyRequiredError):
+        sg.reshape(x.transpose(0, 1), "T*B, D", allow_copy=False)
+    assert sg.reshape(x.transpose(0, 1), "T*B, D").shape == (6, 4)
+
+
+def test_plans_torch():
+    sg = ShapeGuard()
+    x = sg.guard(torch.arange(24.0).reshape(2, 3, 4), "B, T, D")
+    assert sg.rearrange(x, "B, T, D -> D, B*T").shape == (4, 6)
+    assert sg.rearrange(x, "B, T, D -> B", reduction="max").tolist() == [11, 23]
+    assert sg.rearrange(x, "B, T, D -> D", reduction="prod").shape == (4,)
+    assert sg.einsum("B, T, D; D, K -> B, K", x, torch.ones(4, 5)).shape == (2, 5)
+    b = sg.broadcast(torch.ones(2, 4), "B, D", "B, T, D")
+    assert b.shape == (2, 3, 4) and b.stride(1) == 0
+    padded, mask = sg.pad_to_bucket(x, "B, T, D", {"T": [8]})
+    assert padded.shape == (2, 8, 4) and mask.shape == (1, 8, 1)
+    assert torch.equal(padded[:, :3], x)
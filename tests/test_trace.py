@@ -0,0 +1,55 @@
+# Copyright 2018 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from shapeguard import ShapeGuard
+from shapeguard import tools
+from shapeguard import trace
+
+
+def test_recorder_ring_buffer():
+    recorder = trace.TraceRecorder(maxlen=2)
+    sg = ShapeGuard(recorder=recorder)
+    for b in [1, 2, 3]:
+        sg.guard(np.ones([b, 4]), "_B, D")
+    assert len(recorder) == 2
+    record = list(recorder)[-1]
+    assert record.template == "_B, D"
+    assert record.shape == (3, 4)
+    assert record.dims == {"D": 4}
+    assert record.site.startswith(__file__)
+
+
+def test_recorder_file_roundtrip(tmp_path):
+    path = str(tmp_path / "shapes.trace")
+    for _ in range(2):  # the second recorder appends to the same file
+        with trace.TraceRecorder(path) as recorder:
+            for t in [5, 7]:
+                tools.guard(np.ones([2, t]), "B, T", {}, recorder=recorder)
+    records = trace.load(path)
+    assert [r.shape for r in records] == [(2, 5), (2, 7)] * 2
+    assert records[1].dims == {"B": 2, "T": 7}
+
+
+def test_report():
+    recorder = trace.TraceRecorder()
+    for b, t in [(8, 5), (8, 7), (8, 5)]:
+        tools.guard([b, t, 3], "B, T, 3", {}, recorder=recorder)
+    summary = trace.summarize(recorder)
+    (shapes,) = summary["sites"].values()
+    assert shapes == {(8, 5, 3): 2, (8, 7, 3): 1}
+    assert summary["dims"]["T"] == {5: 2, 7: 1}
+    assert summary["varying"] == ["T"]
+    assert "Varying dims: T" in trace.format_report(recorder)